@@ -46,5 +46,12 @@ def get_logger(debug=False):
 # get logging object
 LOG = get_logger(debug=False)
 
-# import show to make execution easier
-from AnimIO.utils import show
+
+def show():
+    """
+    Shows ui
+
+    Imported lazily so the api can be used without a Qt binding.
+    """
+    from AnimIO import utils
+    utils.show()
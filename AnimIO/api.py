@@ -1,11 +1,35 @@
 from __future__ import absolute_import
 
-import json
+import contextlib
+import fnmatch
+import itertools
 
 import pyfbsdk
 import pythonidelib
 
 from AnimIO import LOG
+from AnimIO import binary
+from AnimIO import curve
+from AnimIO import delta
+from AnimIO import fileio
+from AnimIO import jsonstream
+from AnimIO import modes
+from AnimIO import selection
+from AnimIO import store
+
+# file functions live in fileio so they can run without pyfbsdk
+FORMATS = fileio.FORMATS
+write_file = fileio.write_file
+read_file = fileio.read_file
+cache_stats = fileio.cache_stats
+set_cache_size = fileio.set_cache_size
+ClipStore = store.ClipStore
+
+# nesting depth of import_transaction
+_TRANSACTION_DEPTH = 0
+
+# keys read at a time by iter_curve_data, modes are packed per block
+STREAM_BLOCK_SIZE = 4096
 
 
 def flush_output(func):
@@ -32,175 +56,446 @@ def flush_output(func):
     return wrapper
 
 
-def write_file(file_path, anim_data):
+def get_selected(type_filters=(), pattern=None):
     """
-    Writes anim_data to file in json format
+    Gets selected animatable components
 
-    :param file_path: path of file
-    :type file_path: str
+    Answered from the selection index, which follows scene callbacks
+    instead of scanning every component.
 
-    :param anim_data: dict of data
-    :type anim_data: dict
+    :param type_filters: class types to filter
+    :type type_filters: iterable of str
+
+    :param pattern: optional fnmatch pattern LongName must match
+    :type pattern: str or NoneType
+
+    :return: list of components
+    :rtype: list of objects
     """
-    if not file_path.endswith(".json"):
-        file_path += ".json"
+    selected = selection.get_index().selected(type_filters)
 
-    with open(file_path, "w") as write_file:
-        json.dump(anim_data, write_file, sort_keys=True, indent=4)
+    if pattern is not None:
+        selected = [comp for comp in selected
+                    if fnmatch.fnmatchcase(comp.LongName, pattern)]
 
-    LOG.info("Successfully wrote animation data to {0}".format(file_path))
+    return selected
 
 
-def read_file(file_path):
+def find_components(names):
     """
-    Reads anim_data from file
+    Finds animatable components by LongName in a single scene traversal
 
-    :param file_path: path of file
-    :type file_path: str
+    :param names: LongNames to find
+    :type names: list of str
 
-    :return: anim_data
-    :rtype: diict
+    :return: dict of LongName to component
+    :rtype: dict
     """
-    with open(file_path, "r") as read_file:
-        anim_data = json.load(read_file)
+    names = set(names)
+    scene = pyfbsdk.FBSystem().Scene
 
-    LOG.info("Successfully read animation data from {0}".format(file_path))
-    return anim_data
+    found = {}
+    for comp in scene.Components:
+        if selection.is_animatable(comp) and comp.LongName in names:
+            found.setdefault(comp.LongName, comp)
 
+            if len(found) == len(names):
+                break
 
-def get_selected(type_filters=[]):
-    """
-    Gets selected components
+    return found
 
-    :param type_filters: list of class types to filter
-    :type type_filters: list of str
 
-    :return: list of components
-    :rtype: list of objects
+def frame_ticks(frame):
     """
-    scene = pyfbsdk.FBSystem().Scene
+    Converts a frame at the scene frame rate to ticks
 
-    selected = []
-    for comp in scene.Components:
-        if comp.Selected and \
-            hasattr(comp, "Animatable") and \
-                comp.ClassName() not in type_filters:
-            selected.append(comp)
+    :param frame: frame
+    :type frame: int
 
-    return selected
+    :return: time in ticks
+    :rtype: int
+    """
+    return pyfbsdk.FBTime(0, 0, 0, frame, 0).Get()
 
 
-def get_curve_data(fcurve):
+def _bisect_keys(keys, ticks, low=0, right=False):
     """
-    Gets data from fcurve
+    Finds where ticks would be inserted among keys ordered in time,
+    reading the times of log2(len(keys)) keys
+    """
+    high = len(keys)
+    while low < high:
+        middle = (low + high) // 2
+        time = keys[middle].Time.Get()
+        if time < ticks or (right and time == ticks):
+            low = middle + 1
+        else:
+            high = middle
 
-    :param fcurve: fcurve to get data
-    :type fcurve: pyfbsdk.FBFCurve
+    return low
 
-    :return: list of curve data
-    :rtype: list of dict
+
+def key_range(keys, start=None, end=None):
     """
-    key_data_list = []
+    Gets indices of the keys covering a frame range
+
+    The last key at or before start and the first key at or after end
+    are included so the curve is continuous over the whole range.
 
-    for key in fcurve.Keys:
+    :param keys: keys ordered in time
+    :type keys: pyfbsdk.FBPropertyListFCurveKey
 
-        key_data = {
-            'time': key.Time.Get(),
-            'value': key.Value,
-            'interpolation': int(key.Interpolation),
-            'tangent-mode': int(key.TangentMode),
-            'constant-mode': int(key.TangentConstantMode),
-            'left-derivative': key.LeftDerivative,
-            'right-derivative': key.RightDerivative,
-            'left-weight': key.LeftTangentWeight,
-            'right-weight': key.RightTangentWeight
-        }
+    :param start: first frame, from the first key if None
+    :type start: int or NoneType
 
-        key_data_list.append(key_data)
+    :param end: last frame, to the last key if None
+    :type end: int or NoneType
+
+    :return: first index and index past the last key
+    :rtype: tuple of (int, int)
+    """
+    first = 0
+    stop = len(keys)
 
-    return key_data_list
+    if start is not None:
+        first = max(_bisect_keys(keys, frame_ticks(start), right=True) - 1, 0)
 
+    if end is not None:
+        stop = min(_bisect_keys(keys, frame_ticks(end), first) + 1, stop)
 
-def tangent_is_default_weight(tangent_weight):
+    return first, stop
+
+
+def get_curve_data(fcurve, start=None, end=None):
     """
-    Checks if tangent is equal to default value of 1/3
+    Gets data from fcurve
 
-    :param tangent_is_default_weight: value to check
-    :type tangent_is_default_weight: float
+    With start or end set only keys in that frame range and the keys
+    bounding it are read, found by bisecting key times.
 
-    :return: If default weight
-    :rtype: bool
+    :param fcurve: fcurve to get data
+    :type fcurve: pyfbsdk.FBFCurve
+
+    :param start: first frame, from the first key if None
+    :type start: int or NoneType
+
+    :param end: last frame, to the last key if None
+    :type end: int or NoneType
+
+    :return: curve data
+    :rtype: AnimIO.curve.CurveData
+    """
+    keys = all_keys = fcurve.Keys
+    if start is not None or end is not None:
+        keys = (all_keys[i]
+                for i in range(*key_range(all_keys, start, end)))
+
+    curve_data = curve.CurveData()
+    add_time = curve_data.times.append
+    add_value = curve_data.values.append
+    add_left_derivative = curve_data.left_derivatives.append
+    add_right_derivative = curve_data.right_derivatives.append
+    add_left_weight = curve_data.left_weights.append
+    add_right_weight = curve_data.right_weights.append
+
+    # modes are kept as enums and packed per column afterwards
+    interpolations = []
+    tangent_modes = []
+    constant_modes = []
+
+    for key in keys:
+        add_time(key.Time.Get())
+        add_value(key.Value)
+        interpolations.append(key.Interpolation)
+        tangent_modes.append(key.TangentMode)
+        constant_modes.append(key.TangentConstantMode)
+        add_left_derivative(key.LeftDerivative)
+        add_right_derivative(key.RightDerivative)
+        add_left_weight(key.LeftTangentWeight)
+        add_right_weight(key.RightTangentWeight)
+
+    curve_data.interpolations = modes.INTERPOLATION.to_codes(interpolations)
+    curve_data.tangent_modes = modes.TANGENT_MODE.to_codes(tangent_modes)
+    curve_data.constant_modes = modes.CONSTANT_MODE.to_codes(constant_modes)
+
+    return curve_data
+
+
+def iter_curve_data(fcurve):
     """
-    return tangent_weight > 0.3333 and tangent_weight < 0.3334
+    Yields data of fcurve one key at a time
 
+    Keys are read in blocks of STREAM_BLOCK_SIZE so their modes are
+    packed a column at a time by the mode tables, like get_curve_data.
 
-def set_curve_data(fcurve, key_data_list, frame_offset=0):
+    :param fcurve: fcurve to get data
+    :type fcurve: pyfbsdk.FBFCurve
+
+    :return: generator of key data
+    :rtype: generator of dict
+    """
+    keys = iter(fcurve.Keys)
+
+    while True:
+        block = list(itertools.islice(keys, STREAM_BLOCK_SIZE))
+        if not block:
+            return
+
+        for key, interpolation, tangent_mode, constant_mode in zip(
+                block,
+                modes.INTERPOLATION.to_codes(
+                    [key.Interpolation for key in block]),
+                modes.TANGENT_MODE.to_codes(
+                    [key.TangentMode for key in block]),
+                modes.CONSTANT_MODE.to_codes(
+                    [key.TangentConstantMode for key in block])):
+            yield {
+                'time': key.Time.Get(),
+                'value': key.Value,
+                'interpolation': interpolation,
+                'tangent-mode': tangent_mode,
+                'constant-mode': constant_mode,
+                'left-derivative': key.LeftDerivative,
+                'right-derivative': key.RightDerivative,
+                'left-weight': key.LeftTangentWeight,
+                'right-weight': key.RightTangentWeight
+            }
+
+
+tangent_is_default_weight = curve.tangent_is_default_weight
+
+
+# CurveData column, mode table and key property of each key mode
+MODE_FIELDS = (
+    ("interpolations", modes.INTERPOLATION, "Interpolation"),
+    ("tangent_modes", modes.TANGENT_MODE, "TangentMode"),
+    ("constant_modes", modes.CONSTANT_MODE, "TangentConstantMode"),
+)
+
+# CurveData column and key property of tangent derivatives and weights
+DERIVATIVE_FIELDS = (
+    ("left_derivatives", "LeftDerivative"),
+    ("right_derivatives", "RightDerivative"),
+)
+
+WEIGHT_FIELDS = (
+    ("left_weights", "LeftTangentWeight"),
+    ("right_weights", "RightTangentWeight"),
+)
+
+
+def set_curve_data(fcurve, curve_data, frame_offset=0, time_offset=0,
+                   merge=False):
     """
     Sets curve data
 
     :param fcurve: fcurve to set data on
     :type fcurve: pyfbsdk.FBFCurve
 
-    :param key_data_list: key data ordered in time as list
-    :type key_data_list: list of dict
+    :param curve_data: curve or key data as list, sorted by time if
+                       needed, the last of keys sharing a time wins
+    :type curve_data: AnimIO.curve.CurveData or list of dict
 
     :param frame_offset: frame offset value
     :type frame_offset: int
+
+    :param time_offset: offset in ticks, added to frame_offset
+    :type time_offset: int
+
+    :param merge: only add, remove and edit the keys that differ from
+                  the current curve instead of clearing it
+    :type merge: bool
     """
+    # keys are added in time order so each KeyAdd appends to the curve
+    # instead of inserting into it, sorting once if the data is not.
+    # Of keys sharing a time only the last is set, merged or not
+    curve_data = curve.as_curve(curve_data).sorted()
+
     # clear curve first
-    fcurve.EditClear()
+    if not merge:
+        fcurve.EditClear()
 
-    # grab offset in frames
-    fb_offset = pyfbsdk.FBTime(0, 0, 0, frame_offset, 0)
+    # shift the whole time column in ticks, FBTime is only built for KeyAdd
+    if frame_offset:
+        time_offset += frame_ticks(frame_offset)
+    times = curve.offset_times(curve_data.times, time_offset)
 
-    # set keys
-    for key_data in key_data_list:
+    key_count = len(curve_data)
 
-        # add key
-        key_index = fcurve.KeyAdd(
-            pyfbsdk.FBTime(key_data['time']) + fb_offset,
-            key_data['value'])
-        key = fcurve.Keys[key_index]
+    # hold curve updates until every key is set, where the SDK has it
+    batched = hasattr(fcurve, "EditBegin")
+    if batched:
+        fcurve.EditBegin(key_count)
 
-        # set interp
-        key.Interpolation = pyfbsdk.FBInterpolation.values[
-            key_data['interpolation']]
+    try:
+        if merge:
+            changed = _merge_keys(fcurve, curve_data, times)
+            LOG.debug("Merged {0} changed keys".format(changed))
+        else:
+            _add_keys(fcurve, curve_data, times)
+    finally:
+        if batched:
+            fcurve.EditEnd(key_count)
 
-        # set tangent
-        key.TangentMode = pyfbsdk.FBTangentMode.values[
-            key_data['tangent-mode']]
 
-        # not using TCB mode just set to break
-        if key.TangentMode == pyfbsdk.FBTangentMode.kFBTangentModeTCB:
-            key.TangentMode = pyfbsdk.FBTangentMode.kFBTangentModeBreak
+def _add_keys(fcurve, curve_data, times):
+    """
+    Adds every key of curve_data to an empty fcurve
+    """
+    # bind per curve lookups once instead of per key, times are ints
+    # for FBTime even where the column holds doubles (python 2)
+    fb_time = pyfbsdk.FBTime
+    key_add = fcurve.KeyAdd
+    keys = fcurve.Keys
+
+    # set each key completely in one pass
+    for (time, value, interpolation, tangent_mode, constant_mode,
+            left_derivative, right_derivative,
+            left_weight, right_weight) in zip(
+                times,
+                curve_data.values,
+                modes.INTERPOLATION.to_enums(curve_data.interpolations),
+                modes.TANGENT_MODE.to_enums(curve_data.tangent_modes),
+                modes.CONSTANT_MODE.to_enums(curve_data.constant_modes),
+                curve_data.left_derivatives,
+                curve_data.right_derivatives,
+                curve_data.left_weights,
+                curve_data.right_weights):
+
+        key = keys[key_add(fb_time(int(time)), value)]
+
+        key.Interpolation = interpolation
+        key.TangentMode = tangent_mode
+        key.TangentConstantMode = constant_mode
+        key.LeftDerivative = left_derivative
+        key.RightDerivative = right_derivative
 
-        # set tangent constant
-        key.TangentConstantMode = pyfbsdk.FBTangentConstantMode.values[
-            key_data['constant-mode']]
+        # set tangent if needed to keep tangents from being unlocked
+        if not tangent_is_default_weight(left_weight):
+            key.LeftTangentWeight = left_weight
 
-    # set tangents
-    for i, key_data in enumerate(key_data_list):
-        key = fcurve.Keys[i]
+        if not tangent_is_default_weight(right_weight):
+            key.RightTangentWeight = right_weight
 
-        key.LeftDerivative = key_data['left-derivative']
-        key.RightDerivative = key_data['right-derivative']
 
-        # set tangent if needed to keep tangents from being unlocked
-        if not tangent_is_default_weight(key_data['left-weight']):
-            key.LeftTangentWeight = key_data['left-weight']
+def _set_key(key, curve_data, index):
+    """
+    Sets modes, derivatives and weights of a new key
+    """
+    for column, table, name in MODE_FIELDS:
+        setattr(key, name, table.enums[getattr(curve_data, column)[index]])
+
+    for column, name in DERIVATIVE_FIELDS:
+        setattr(key, name, getattr(curve_data, column)[index])
 
-        if not tangent_is_default_weight(key_data['right-weight']):
-            key.RightTangentWeight = key_data['right-weight']
+    for column, name in WEIGHT_FIELDS:
+        weight = getattr(curve_data, column)[index]
+        if not tangent_is_default_weight(weight):
+            setattr(key, name, weight)
+
+
+def _update_key(key, current, old, curve_data, new):
+    """
+    Sets only the properties of an existing key that differ
+
+    :return: If the key was edited
+    :rtype: bool
+    """
+    edited = False
+
+    value = curve_data.values[new]
+    if current.values[old] != value:
+        key.Value = value
+        edited = True
+
+    for column, table, name in MODE_FIELDS:
+        code = getattr(curve_data, column)[new]
+        if getattr(current, column)[old] != table.resolved[code]:
+            setattr(key, name, table.enums[code])
+            edited = True
+
+    for column, name in DERIVATIVE_FIELDS:
+        derivative = getattr(curve_data, column)[new]
+        if getattr(current, column)[old] != derivative:
+            setattr(key, name, derivative)
+            edited = True
+
+    # weights going back to default are handled by replacing the key
+    for column, name in WEIGHT_FIELDS:
+        weight = getattr(curve_data, column)[new]
+        if (not tangent_is_default_weight(weight) and
+                getattr(current, column)[old] != weight):
+            setattr(key, name, weight)
+            edited = True
+
+    return edited
+
+
+def _merge_keys(fcurve, curve_data, times):
+    """
+    Turns the keys of fcurve into curve_data touching only differing keys
+
+    :return: number of keys added, removed or edited
+    :rtype: int
+    """
+    current = get_curve_data(fcurve)
+    wanted = dict((time, index) for index, time in enumerate(times))
+
+    def is_replaced(old, new):
+        # a weight can only be set back to default on a fresh key
+        for column, _ in WEIGHT_FIELDS:
+            if (tangent_is_default_weight(getattr(curve_data, column)[new])
+                    and not tangent_is_default_weight(
+                        getattr(current, column)[old])):
+                return True
+        return False
+
+    # remove keys from the back so indices of earlier keys hold
+    changed = 0
+    kept = []
+    for old in reversed(range(len(current))):
+        new = wanted.get(current.times[old])
+        if new is None or is_replaced(old, new):
+            fcurve.KeyRemove(old)
+            changed += 1
+        else:
+            kept.append(old)
+    kept.reverse()
+
+    # kept keys are now a subset of times, walk both in time order
+    fb_time = pyfbsdk.FBTime
+    keys = fcurve.Keys
+    position = 0
+
+    for new, time in enumerate(times):
+        if position < len(kept) and current.times[kept[position]] == time:
+            if _update_key(keys[new], current, kept[position],
+                           curve_data, new):
+                changed += 1
+            position += 1
+        else:
+            key = keys[fcurve.KeyAdd(
+                fb_time(int(time)), curve_data.values[new])]
+            _set_key(key, curve_data, new)
+            changed += 1
+
+    return changed
 
 
 @flush_output
-def get_animdata(item):
+def get_animdata(item, start=None, end=None):
     """
     Gets animation translation and rotation of item
 
     :param item: item to get data from
     :type item: pyfbsdk component
 
+    :param start: first frame, from the first key if None
+    :type start: int or NoneType
+
+    :param end: last frame, to the last key if None
+    :type end: int or NoneType
+
     :return: dict of data
     :rtype: dict
     """
@@ -220,51 +515,123 @@ def get_animdata(item):
         for i, anim_node in enumerate(trans_anim_node.Nodes):
             if anim_node.FCurve and len(anim_node.FCurve.Keys):
                 anim_data["Translation"].append(
-                    get_curve_data(anim_node.FCurve))
+                    get_curve_data(anim_node.FCurve, start, end))
             else:
                 anim_data["Translation"].append(
-                    [{"value": item.Translation[i],
-                     "static": True}])
+                    curve.CurveData.from_static(item.Translation[i]))
     else:
-        for i in xrange(3):
+        for i in range(3):
             anim_data["Translation"].append(
-                [{"value": item.Translation[i],
-                 "static": True}])
+                curve.CurveData.from_static(item.Translation[i]))
 
     if rots_anim_node:
         for i, anim_node in enumerate(rots_anim_node.Nodes):
             if anim_node.FCurve and len(anim_node.FCurve.Keys):
                 anim_data["Rotation"].append(
-                    get_curve_data(anim_node.FCurve))
+                    get_curve_data(anim_node.FCurve, start, end))
             else:
                 anim_data["Rotation"].append(
-                    [{"value": item.Rotation[i],
-                     "static": True}])
+                    curve.CurveData.from_static(item.Rotation[i]))
     else:
-        for i in xrange(3):
+        for i in range(3):
             anim_data["Rotation"].append(
-                [{"value": item.Rotation[i],
-                 "static": True}])
+                curve.CurveData.from_static(item.Rotation[i]))
 
     return anim_data
 
 
+def _iter_channels(prop):
+    """
+    Yields key generators for each channel of a vector property
+    """
+    anim_node = prop.GetAnimationNode()
+    nodes = anim_node.Nodes if anim_node else [None] * 3
+
+    for i, node in enumerate(nodes):
+        if node and node.FCurve and len(node.FCurve.Keys):
+            yield iter_curve_data(node.FCurve)
+        else:
+            yield iter([{"value": prop[i], "static": True}])
+
+
+def iter_animdata(item):
+    """
+    Gets generators over the translation and rotation keys of item
+
+    Nothing is read from the item until the generators are consumed.
+
+    :param item: item to get data from
+    :type item: pyfbsdk component
+
+    :return: dict of attribute to generator of channels
+    :rtype: dict
+    """
+    if not item.Translation.GetAnimationNode() and \
+            not item.Rotation.GetAnimationNode():
+        raise RuntimeError(
+            "No animation found on Translation or Rotation of {0}".format(
+                item.LongName))
+
+    return {"Translation": _iter_channels(item.Translation),
+            "Rotation": _iter_channels(item.Rotation)}
+
+
+@flush_output
+def stream_animdata(item, file_path):
+    """
+    Writes animation of item to a json file while reading it
+
+    Keys are read in blocks of STREAM_BLOCK_SIZE and written as they are
+    read, so peak memory is bounded by one block regardless of take
+    length. The file matches the json schema of write_file.
+
+    :param item: item to get data from
+    :type item: pyfbsdk component
+
+    :param file_path: path of file
+    :type file_path: str
+    """
+    file_path, compression = fileio.split_compression(file_path)
+    if not file_path.endswith(".json"):
+        file_path += ".json"
+
+    if compression is not None:
+        file_path += fileio.COMPRESSIONS[compression]
+
+    with fileio.open_file(file_path, "w") as write_file:
+        key_count = jsonstream.write(write_file, iter_animdata(item))
+
+    LOG.info("Successfully streamed {0} keys to {1}".format(
+        key_count, file_path))
+
+
 def get_startframe(anim_data):
     """
-    Gets startframe from data
+    Gets start time of the translation channels from data
+
+    Keys are ordered in time so only the first time of each column is
+    compared.
 
     :param anim_data: dict of data
     :type anim_data: dict
 
-    :return: int or None
+    :return: start time in ticks or None
     :rtype: int or NoneType
     """
     # get start frame to offset from
+    channels = anim_data["Translation"]
+
     start_frames = []
-    for t in anim_data["Translation"]:
-        time_value = t[0].get("time")
-        if time_value is not None:
-            start_frames.append(time_value)
+    if isinstance(channels, binary.LazyChannels):
+        for i in range(len(channels)):
+            time_value = channels.start_time(i)
+            if time_value is not None:
+                start_frames.append(time_value)
+    else:
+        for t in channels:
+            t = curve.as_curve(t)
+            if len(t):
+                start_frames.append(t.times[0])
 
     if start_frames:
         return min(start_frames)
@@ -272,57 +639,313 @@ def get_startframe(anim_data):
         return None
 
 
-@flush_output
-def set_animdata(item, anim_data, start_frame=None):
+def get_time_offset(start_frame, start_time):
     """
-    Sets animation on component's animation node
+    Gets the offset moving start_time onto start_frame
 
-    :param item: item to get data from
-    :type item: pyfbsdk component
+    :param start_frame: frame to move the start of the animation to
+    :type start_frame: int or NoneType
+
+    :param start_time: start time in ticks from get_startframe
+    :type start_time: int or NoneType
+
+    :return: offset in ticks
+    :rtype: int
+    """
+    if start_frame is None or start_time is None:
+        return 0
+
+    return frame_ticks(start_frame) - start_time
+
+
+def check_animdata(anim_data):
+    """
+    Checks anim data contains translation and rotation entries
 
     :param anim_data: dict of data
     :type anim_data: dict
 
-    :param frame_offset: frame offset value
-    :type frame_offset: int
+    :raises: ``RuntimeError`` if an entry is missing
     """
-    # make sure anim data contains translation and rotation entries
     if not anim_data.get("Translation", None):
         raise RuntimeError("No translation in animation data!")
 
     if not anim_data.get("Rotation", None):
         raise RuntimeError("No rotation in animation data!")
 
-    # get frame offset
-    frame_offset = 0
-    anim_start_frame = get_startframe(anim_data)
-    if start_frame is not None and anim_start_frame is not None:
-        frame_offset = start_frame - anim_start_frame
-
-    # set translation static
-    item.Translation = pyfbsdk.FBVector3d(
-        [value[0].get("value", 0.0) for value in anim_data["Translation"]])
-
-    for i, value in enumerate(anim_data["Translation"]):
-        if not value[0].get("static", False):
-            item.Translation.SetAnimated(True)
-            trans_anim_node = item.Translation.GetAnimationNode()
-            set_curve_data(
-                trans_anim_node.Nodes[i].FCurve,
-                value,
-                frame_offset)
-
-    # set rotation
-    item.Rotation = pyfbsdk.FBVector3d(
-        [value[0].get("value", 0.0) for value in anim_data["Rotation"]])
-
-    for i, value in enumerate(anim_data["Rotation"]):
-        if not value[0].get("static", False):
-            item.Rotation.SetAnimated(True)
-            rots_anim_node = item.Rotation.GetAnimationNode()
-            set_curve_data(
-                rots_anim_node.Nodes[i].FCurve,
-                value,
-                frame_offset)
+
+@flush_output
+def set_animdata(item, anim_data, start_frame=None, merge=False):
+    """
+    Sets animation on component's animation node
+
+    :param item: item to get data from
+    :type item: pyfbsdk component
+
+    :param anim_data: dict of data
+    :type anim_data: dict
+
+    :param start_frame: frame to move the start of the animation to
+    :type start_frame: int or NoneType
+
+    :param merge: only change keys that differ from the current curves
+    :type merge: bool
+    """
+    check_animdata(anim_data)
+
+    time_offset = get_time_offset(start_frame, get_startframe(anim_data))
+    with import_transaction():
+        apply_animdata(item, anim_data, time_offset, merge)
+
+
+def apply_animdata(item, anim_data, time_offset=0, merge=False):
+    """
+    Sets animation on component's animation node with a time offset
+
+    :param item: item to get data from
+    :type item: pyfbsdk component
+
+    :param anim_data: dict of data
+    :type anim_data: dict
+
+    :param time_offset: offset in ticks
+    :type time_offset: int
+
+    :param merge: only change keys that differ from the current curves
+    :type merge: bool
+    """
+    for attribute in curve.ATTRIBUTES:
+        channels = [curve.as_curve(value) for value in anim_data[attribute]]
+
+        # set static values
+        setattr(item, attribute, pyfbsdk.FBVector3d(
+            [value.values[0] if value.values else 0.0
+             for value in channels]))
+
+        if all(value.static for value in channels):
+            continue
+
+        # animate the property once, then key each animated channel
+        prop = getattr(item, attribute)
+        prop.SetAnimated(True)
+        anim_node = prop.GetAnimationNode()
+
+        for i, value in enumerate(channels):
+            if not value.static:
+                set_curve_data(
+                    anim_node.Nodes[i].FCurve,
+                    value,
+                    time_offset=time_offset,
+                    merge=merge)
+
+    LOG.info("Animation set on {0}".format(item.LongName))
+
+
+@contextlib.contextmanager
+def import_transaction():
+    """
+    Suspends model change notification and scene evaluation while
+    animation is set, then evaluates the scene once
+
+    Nested transactions join the outermost one.
+    """
+    global _TRANSACTION_DEPTH
+
+    outermost = not _TRANSACTION_DEPTH
+    _TRANSACTION_DEPTH += 1
+
+    if outermost:
+        pyfbsdk.FBBeginChangeAllModels()
+
+    try:
+        yield
+    finally:
+        _TRANSACTION_DEPTH -= 1
+
+        if outermost:
+            pyfbsdk.FBEndChangeAllModels()
+            pyfbsdk.FBSystem().Scene.Evaluate()
+
+
+def _read_stream_patches(file_path):
+    """
+    Gets the channels incremental exports patched over a json file
+    """
+    manifest = delta.read_manifest(file_path)
+    if manifest is None:
+        return {}
+    return delta.read_patches(file_path, manifest)
+
+
+def _iter_stream_channels(read_file, patched):
+    """
+    Yields channels of an open json file as they are parsed, with the
+    patched channels of incremental exports in place of stale ones
+    """
+    remaining = dict(patched)
+    for name, attribute, index, key_data_list in \
+            jsonstream.iter_channels(read_file):
+        yield name, attribute, index, remaining.pop(
+            (name, attribute, index), key_data_list)
+
+    # channels added by a patch are not in the base file
+    for (name, attribute, index), curve_data in sorted(remaining.items()):
+        yield name, attribute, index, curve_data
+
+
+def _stream_startframe(file_path, patched):
+    """
+    Gets start time of a json file without holding more than one channel
+    """
+    start_frames = []
+    with fileio.open_file(file_path, "r") as read_file:
+        for _, attribute, _, key_data_list in \
+                _iter_stream_channels(read_file, patched):
+            if attribute == "Translation" and key_data_list:
+                time_value = key_data_list[0].get("time")
+                if time_value is not None:
+                    start_frames.append(time_value)
+
+    if start_frames:
+        return min(start_frames)
+    else:
+        return None
+
+
+def _apply_channel(item, attribute, index, curve_data, time_offset=0):
+    """
+    Sets a single channel of a vector property
+    """
+    prop = getattr(item, attribute)
+
+    vector = pyfbsdk.FBVector3d(prop[0], prop[1], prop[2])
+    if curve_data.values:
+        vector[index] = curve_data.values[0]
+    setattr(item, attribute, vector)
+
+    if not curve_data.static:
+        prop.SetAnimated(True)
+        set_curve_data(
+            prop.GetAnimationNode().Nodes[index].FCurve,
+            curve_data,
+            time_offset=time_offset)
+
+
+@flush_output
+def stream_set_animdata(item, file_path, start_frame=None):
+    """
+    Sets animation on item from a json file while it is being parsed
+
+    Each channel is keyed as soon as it has been read so only one channel
+    is held in memory. Setting start_frame needs the start of the
+    Translation channels first, which costs an extra parse of the file.
+    Channels patched by incremental exports replace those of the file.
+
+    :param item: item to set data on
+    :type item: pyfbsdk component
+
+    :param file_path: path of json file
+    :type file_path: str
+
+    :param start_frame: frame to move the start of the animation to
+    :type start_frame: int or NoneType
+    """
+    patched = _read_stream_patches(file_path)
+
+    time_offset = 0
+    if start_frame is not None:
+        time_offset = get_time_offset(
+            start_frame, _stream_startframe(file_path, patched))
+
+    found = set()
+    with import_transaction(), \
+            fileio.open_file(file_path, "r") as read_file:
+        for name, attribute, index, key_data_list in \
+                _iter_stream_channels(read_file, patched):
+            if name:
+                raise RuntimeError(
+                    "{0} holds multiple objects! "
+                    "Use set_batch_animdata instead.".format(file_path))
+
+            _apply_channel(
+                item, attribute, index,
+                curve.as_curve(key_data_list),
+                time_offset)
+            found.add(attribute)
+
+    for attribute in curve.ATTRIBUTES:
+        if attribute not in found:
+            raise RuntimeError(
+                "No {0} in animation data!".format(attribute.lower()))
 
     LOG.info("Animation set on {0}".format(item.LongName))
+
+
+@flush_output
+def get_batch_animdata(items):
+    """
+    Gets animation of multiple items keyed by LongName
+
+    Items without translation or rotation animation are skipped.
+
+    :param items: items to get data from, usually from get_selected
+    :type items: list of pyfbsdk components
+
+    :return: batch data
+    :rtype: dict
+    """
+    objects = {}
+    for item in items:
+        try:
+            objects[item.LongName] = get_animdata(item)
+        except RuntimeError as err:
+            LOG.warning(str(err))
+
+    if not objects:
+        raise RuntimeError("No animation found on any item!")
+
+    return {curve.BATCH_KEY: objects}
+
+
+@flush_output
+def set_batch_animdata(batch_data, start_frame=None, merge=False):
+    """
+    Sets animation of multiple objects found by LongName
+
+    Targets are resolved in one scene traversal. When start_frame is set
+    every object is offset by the same amount so their relative timing is
+    kept.
+
+    :param batch_data: batch data from get_batch_animdata or read_file
+    :type batch_data: dict
+
+    :param start_frame: frame to move the start of the animation to
+    :type start_frame: int or NoneType
+
+    :param merge: only change keys that differ from the current curves
+    :type merge: bool
+
+    :return: LongNames of objects animation was set on
+    :rtype: list of str
+    """
+    objects = batch_data[curve.BATCH_KEY]
+    for anim_data in objects.values():
+        check_animdata(anim_data)
+
+    found = find_components(objects.keys())
+    for name in sorted(set(objects) - set(found)):
+        LOG.warning("Could not find {0} in scene, skipping.".format(name))
+
+    # get time offset shared by all objects
+    start_times = [
+        start_time for start_time in (
+            get_startframe(objects[name]) for name in found)
+        if start_time is not None]
+    time_offset = get_time_offset(
+        start_frame, min(start_times) if start_times else None)
+
+    with import_transaction():
+        for name in sorted(found):
+            apply_animdata(found[name], objects[name], time_offset, merge)
+
+    return sorted(found)
@@ -0,0 +1,452 @@
+"""
+Binary animation file format
+
+Layout (little endian)::
+
+    header         magic "AIOB", uint16 version, uint16 reserved,
+                   uint32 channel count
+    channel table  per channel: uint16 name length, utf-8 object name
+                   (version 2+, empty for single object files), uint16 name
+                   length, utf-8 attribute name, uint16 channel index,
+                   uint8 flags, 5 pad bytes, uint64 key count,
+                   uint64 data offset, float64 static value
+    channel data   per channel, 8 byte aligned: int64 times, float64 values,
+                   left/right derivatives, left/right weights followed by
+                   uint8 interpolation, tangent and constant modes
+"""
+from __future__ import absolute_import
+
+import mmap
+import struct
+import sys
+from array import array
+
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:
+    from collections import Mapping, Sequence
+
+from AnimIO import curve
+
+MAGIC = b"AIOB"
+VERSION = 2
+EXTENSION = ".aio"
+
+FLAG_STATIC = 1
+
+HEADER = struct.Struct("<4sHHI")
+NAME_LENGTH = struct.Struct("<H")
+CHANNEL = struct.Struct("<HB5xQQd")
+
+# header of a channel packed on its own: uint8 flags, 7 pad bytes,
+# uint64 key count, float64 static value, columns follow
+PACKED_CHANNEL = struct.Struct("<B7xQd")
+
+# column attribute and on-disk typecode, wide columns first for alignment
+DISK_COLUMNS = (
+    ('times', 'q'),
+    ('values', 'd'),
+    ('left_derivatives', 'd'),
+    ('right_derivatives', 'd'),
+    ('left_weights', 'd'),
+    ('right_weights', 'd'),
+    ('interpolations', 'B'),
+    ('tangent_modes', 'B'),
+    ('constant_modes', 'B'),
+)
+
+ITEMSIZE = {'q': 8, 'd': 8, 'B': 1}
+
+KEY_SIZE = sum(ITEMSIZE[typecode] for _, typecode in DISK_COLUMNS)
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _column_bytes(column, typecode):
+    """
+    Packs an array column as little endian bytes
+    """
+    if typecode != column.typecode:
+        if typecode == 'q' and curve.TIME_TYPECODE != 'q':
+            return struct.pack(
+                "<{0}q".format(len(column)), *[int(v) for v in column])
+        column = array(typecode, column)
+
+    if sys.byteorder == "big":
+        column = array(typecode, column)
+        column.byteswap()
+
+    if hasattr(column, "tobytes"):
+        return column.tobytes()
+    return column.tostring()
+
+
+def _bytes_column(data, typecode, memory_typecode):
+    """
+    Unpacks little endian bytes into an array column
+    """
+    if typecode == 'q' and memory_typecode != 'q':
+        return array(memory_typecode, struct.unpack(
+            "<{0}q".format(len(data) // 8), data))
+
+    column = array(typecode)
+    if hasattr(column, "frombytes"):
+        column.frombytes(data)
+    else:
+        column.fromstring(bytes(data))
+
+    if sys.byteorder == "big":
+        column.byteswap()
+
+    return column
+
+
+def is_binary(file_path):
+    """
+    Checks magic bytes of file
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :return: If file is a binary animation file
+    :rtype: bool
+    """
+    with open(file_path, "rb") as read_file:
+        return read_file.read(len(MAGIC)) == MAGIC
+
+
+def iter_channels(anim_data):
+    """
+    Yields channels of anim_data in file order
+
+    :param anim_data: dict of data or batch data
+    :type anim_data: dict
+
+    :return: generator of (object name, attribute, index, curve)
+    :rtype: generator
+    """
+    if curve.is_batch(anim_data):
+        objects = anim_data[curve.BATCH_KEY]
+        items = [(name, objects[name]) for name in sorted(objects)]
+    else:
+        items = [("", anim_data)]
+
+    for name, object_data in items:
+        for attribute in curve.ATTRIBUTES:
+            for index, channel in enumerate(
+                    object_data.get(attribute, [])):
+                yield name, attribute, index, curve.as_curve(channel)
+
+
+def write(write_file, anim_data):
+    """
+    Writes anim_data to an open binary file
+
+    :param write_file: file opened for binary writing
+    :type write_file: file
+
+    :param anim_data: dict of data or batch data
+    :type anim_data: dict
+    """
+    channels = list(iter_channels(anim_data))
+
+    # size channel table so data offsets are known up front
+    table_size = HEADER.size
+    for name, attribute, _, _ in channels:
+        table_size += (2 * NAME_LENGTH.size + len(name.encode("utf-8")) +
+                       len(attribute.encode("utf-8")) + CHANNEL.size)
+
+    offset = _align(table_size)
+    table = [HEADER.pack(MAGIC, VERSION, 0, len(channels))]
+    for name, attribute, index, channel in channels:
+        flags = FLAG_STATIC if channel.static else 0
+        static_value = channel.values[0] if channel.static else 0.0
+
+        for text in (name, attribute):
+            text = text.encode("utf-8")
+            table.append(NAME_LENGTH.pack(len(text)))
+            table.append(text)
+
+        table.append(CHANNEL.pack(
+            index, flags, len(channel), offset, static_value))
+
+        offset = _align(offset + len(channel) * KEY_SIZE)
+
+    write_file.write(b"".join(table))
+    position = table_size
+
+    for _, _, _, channel in channels:
+        if not len(channel):
+            continue
+
+        padding = _align(position) - position
+        write_file.write(b"\0" * padding)
+        position += padding
+
+        for column, typecode in DISK_COLUMNS:
+            data = _column_bytes(getattr(channel, column), typecode)
+            write_file.write(data)
+            position += len(data)
+
+
+def read_table(buf):
+    """
+    Reads header and channel table
+
+    :param buf: file contents or leading bytes of file
+    :type buf: bytes or mmap
+
+    :raises: ``ValueError`` if not a binary animation file
+
+    :return: list of (object name, attribute, index, flags, count, offset,
+             static value)
+    :rtype: list of tuple
+    """
+    magic, version, _, channel_count = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("Not an AnimIO binary file!")
+
+    if version > VERSION:
+        raise ValueError(
+            "Unsupported AnimIO binary version {0}".format(version))
+
+    def read_name(position):
+        name_length, = NAME_LENGTH.unpack_from(buf, position)
+        position += NAME_LENGTH.size
+        name = bytes(buf[position:position + name_length]).decode("utf-8")
+        return name, position + name_length
+
+    position = HEADER.size
+    table = []
+    for _ in range(channel_count):
+        name = ""
+        if version >= 2:
+            name, position = read_name(position)
+        attribute, position = read_name(position)
+
+        index, flags, count, offset, static_value = CHANNEL.unpack_from(
+            buf, position)
+        position += CHANNEL.size
+
+        table.append(
+            (name, attribute, index, flags, count, offset, static_value))
+
+    return table
+
+
+def read_channel(buf, flags, count, offset, static_value):
+    """
+    Reads a single channel
+
+    :param buf: file contents
+    :type buf: bytes or mmap
+
+    :return: curve
+    :rtype: AnimIO.curve.CurveData
+    """
+    if flags & FLAG_STATIC:
+        return curve.CurveData.from_static(static_value)
+
+    channel = curve.CurveData()
+    for column, typecode in DISK_COLUMNS:
+        size = count * ITEMSIZE[typecode]
+        setattr(channel, column, _bytes_column(
+            buf[offset:offset + size],
+            typecode,
+            getattr(channel, column).typecode))
+        offset += size
+
+    return channel
+
+
+def pack_channel(channel):
+    """
+    Packs a single channel with its columns as bytes
+
+    :param channel: channel to pack
+    :type channel: AnimIO.curve.CurveData
+
+    :return: packed channel
+    :rtype: bytes
+    """
+    flags = FLAG_STATIC if channel.static else 0
+    static_value = channel.values[0] if channel.static else 0.0
+
+    data = [PACKED_CHANNEL.pack(flags, len(channel), static_value)]
+    if len(channel):
+        for column, typecode in DISK_COLUMNS:
+            data.append(_column_bytes(getattr(channel, column), typecode))
+
+    return b"".join(data)
+
+
+def unpack_channel(data):
+    """
+    Unpacks a channel packed by pack_channel
+
+    :param data: packed channel
+    :type data: bytes
+
+    :return: curve
+    :rtype: AnimIO.curve.CurveData
+    """
+    flags, count, static_value = PACKED_CHANNEL.unpack_from(data)
+    return read_channel(data, flags, count, PACKED_CHANNEL.size, static_value)
+
+
+def _group_table(table):
+    """
+    Groups channel table entries by object and attribute, ordered by
+    channel index
+    """
+    grouped = {}
+    for entry in table:
+        name, attribute, index = entry[:3]
+        entries = grouped.setdefault(name, {}).setdefault(attribute, [])
+        entries.extend([None] * (index + 1 - len(entries)))
+        entries[index] = entry[3:]
+
+    return grouped
+
+
+def _build(grouped, make_object):
+    """
+    Builds anim_data or batch data from grouped table entries
+    """
+    if list(grouped) == [""]:
+        return make_object(grouped[""])
+
+    return {curve.BATCH_KEY: dict(
+        (name, make_object(attributes))
+        for name, attributes in grouped.items())}
+
+
+def read(read_file):
+    """
+    Reads anim_data from an open binary file
+
+    :param read_file: file opened for binary reading
+    :type read_file: file
+
+    :return: anim_data
+    :rtype: dict
+    """
+    buf = read_file.read()
+
+    def make_object(attributes):
+        return dict(
+            (attribute, [read_channel(buf, *entry) for entry in entries])
+            for attribute, entries in attributes.items())
+
+    return _build(_group_table(read_table(buf)), make_object)
+
+
+class LazyChannels(Sequence):
+    """
+    Channels of one attribute, read from the mapped file on access
+    """
+    def __init__(self, buf, entries):
+        self._buf = buf
+        self._entries = entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        return read_channel(self._buf, *self._entries[index])
+
+    def key_count(self, index):
+        """
+        Number of keys of a channel without reading it
+
+        :param index: channel index
+        :type index: int
+
+        :return: key count
+        :rtype: int
+        """
+        return self._entries[index][1]
+
+    def start_time(self, index):
+        """
+        Time of the first key of a channel without reading it
+
+        :param index: channel index
+        :type index: int
+
+        :return: time in ticks or None if channel has no keys
+        :rtype: int or NoneType
+        """
+        flags, count, offset, _ = self._entries[index]
+        if flags & FLAG_STATIC or not count:
+            return None
+
+        return struct.unpack_from("<q", self._buf, offset)[0]
+
+
+class LazyObjectData(Mapping):
+    """
+    Attributes of one object, mapping attribute names to LazyChannels
+    """
+    def __init__(self, buf, attributes):
+        self._buf = buf
+        self._attributes = attributes
+
+    def __getitem__(self, attribute):
+        return LazyChannels(self._buf, self._attributes[attribute])
+
+    def __iter__(self):
+        return iter(self._attributes)
+
+    def __len__(self):
+        return len(self._attributes)
+
+
+class LazyAnimData(Mapping):
+    """
+    Memory mapped binary animation file.
+
+    Behaves like the anim_data dict returned by ``read`` but only reads the
+    header up front, channels are read from the mapping when indexed.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+        with open(file_path, "rb") as read_file:
+            self._buf = mmap.mmap(
+                read_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            grouped = _group_table(read_table(self._buf))
+        except BaseException:
+            self._buf.close()
+            raise
+
+        self._data = _build(
+            grouped, lambda attributes: LazyObjectData(self._buf, attributes))
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def close(self):
+        """
+        Closes the file mapping
+        """
+        self._buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,144 @@
+"""
+Size bounded least recently used cache
+"""
+from __future__ import absolute_import
+
+import os
+import threading
+from collections import OrderedDict
+
+
+def file_key(file_path):
+    """
+    Gets a key that changes whenever the file changes
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :return: (real path, size, modification time)
+    :rtype: tuple
+    """
+    real_path = os.path.realpath(file_path)
+    stat = os.stat(real_path)
+    return (real_path,
+            stat.st_size,
+            getattr(stat, "st_mtime_ns", stat.st_mtime))
+
+
+class LRUCache(object):
+    """
+    Thread safe LRU cache evicting by total size instead of entry count
+
+    :param max_bytes: size budget of all values
+    :type max_bytes: int
+
+    :param sizeof: gets the size of a value in bytes
+    :type sizeof: function
+    """
+    def __init__(self, max_bytes, sizeof=len):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Gets a value, marking it most recently used
+
+        :return: value or default if not cached
+        :rtype: object
+        """
+        with self._lock:
+            try:
+                value, size = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._entries[key] = (value, size)
+            return value
+
+    def put(self, key, value):
+        """
+        Adds a value, evicting least recently used values over budget
+
+        Values larger than the whole budget are not cached.
+
+        :return: If value was cached
+        :rtype: bool
+        """
+        size = self.sizeof(value)
+
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+
+            if size > self.max_bytes:
+                return False
+
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            self._evict()
+
+            return True
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.nbytes -= evicted_size
+
+    def resize(self, max_bytes):
+        """
+        Changes the size budget, evicting values over the new budget
+
+        :param max_bytes: size budget of all values
+        :type max_bytes: int
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def discard(self, key):
+        """
+        Removes a value if cached
+        """
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """
+        Removes all values and resets the statistics
+        """
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Gets hit and miss counts and memory use
+
+        :return: hits, misses, entries, nbytes and max_bytes
+        :rtype: dict
+        """
+        with self._lock:
+            return {"hits": self.hits,
+                    "misses": self.misses,
+                    "entries": len(self._entries),
+                    "nbytes": self.nbytes,
+                    "max_bytes": self.max_bytes}
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
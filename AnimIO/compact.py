@@ -0,0 +1,189 @@
+"""
+Compact json schema
+
+Stores each channel as a dict of per-field arrays under short names
+instead of a list of key dicts, tagged with a version so read_file can
+tell it from the original layout::
+
+    {"version":2,"Rotation":[{"t":[...],"v":[...],...},...],...}
+
+Fields shared by every key of a channel are hoisted to a single value,
+tangent weights equal to the 1/3 default are written as null and a weight
+field that is default on every key is left out. Static channels are
+stored as ``{"s":1,"v":value}``.
+"""
+from __future__ import absolute_import
+
+from array import array
+
+from AnimIO import curve
+
+VERSION = 2
+VERSION_KEY = "version"
+
+# separators for json.dump without whitespace
+SEPARATORS = (",", ":")
+
+# short field name per column
+SHORT_NAMES = (
+    ("t", "times"),
+    ("v", "values"),
+    ("i", "interpolations"),
+    ("m", "tangent_modes"),
+    ("c", "constant_modes"),
+    ("ld", "left_derivatives"),
+    ("rd", "right_derivatives"),
+    ("lw", "left_weights"),
+    ("rw", "right_weights"),
+)
+
+WEIGHT_NAMES = ("lw", "rw")
+
+STATIC_KEY = "s"
+
+
+def is_compact(data):
+    """
+    Checks if loaded json uses the compact schema
+
+    :param data: loaded json
+    :type data: dict
+
+    :return: If compact schema
+    :rtype: bool
+    """
+    return data.get(VERSION_KEY, 1) >= VERSION
+
+
+def encode_curve(curve_data):
+    """
+    Encodes a curve as a dict of field arrays
+
+    :param curve_data: curve to encode
+    :type curve_data: AnimIO.curve.CurveData or list of dict
+
+    :return: json serializable channel
+    :rtype: dict
+    """
+    curve_data = curve.as_curve(curve_data)
+
+    if curve_data.static:
+        return {STATIC_KEY: 1, "v": curve_data.values[0]}
+
+    # ticks are written as ints where the column holds doubles (python 2)
+    times = curve_data.times
+    if times.typecode == 'q':
+        channel = {"t": times.tolist()}
+    else:
+        channel = {"t": [int(time) for time in times]}
+
+    for name, column in SHORT_NAMES[1:]:
+        values = getattr(curve_data, column)
+        shared = curve.constant_value(values)
+
+        if name in WEIGHT_NAMES:
+            if shared is None:
+                channel[name] = [
+                    None if curve.tangent_is_default_weight(weight)
+                    else weight for weight in values]
+            elif not curve.tangent_is_default_weight(shared):
+                channel[name] = shared
+
+        elif shared is None:
+            channel[name] = values.tolist()
+
+        else:
+            channel[name] = shared
+
+    return channel
+
+
+def decode_curve(channel):
+    """
+    Decodes a dict of field arrays
+
+    :param channel: channel loaded from json
+    :type channel: dict
+
+    :return: curve
+    :rtype: AnimIO.curve.CurveData
+    """
+    if channel.get(STATIC_KEY):
+        return curve.CurveData.from_static(channel["v"])
+
+    curve_data = curve.CurveData()
+    key_count = len(channel["t"])
+
+    for name, column in SHORT_NAMES:
+        target = getattr(curve_data, column)
+
+        if name in WEIGHT_NAMES:
+            values = channel.get(name, curve.DEFAULT_WEIGHT)
+            if isinstance(values, list):
+                values = [
+                    curve.DEFAULT_WEIGHT if weight is None else weight
+                    for weight in values]
+        else:
+            values = channel[name]
+
+        if isinstance(values, list):
+            target.extend(array(target.typecode, values))
+        else:
+            target.extend(array(target.typecode, [values]) * key_count)
+
+    return curve_data
+
+
+def _map_channels(anim_data, func):
+    converted = {}
+    for attribute in curve.ATTRIBUTES:
+        if attribute in anim_data:
+            converted[attribute] = [
+                func(channel) for channel in anim_data[attribute]]
+
+    return converted
+
+
+def encode(anim_data):
+    """
+    Encodes anim_data or batch data in the compact schema
+
+    :param anim_data: dict of data or batch data
+    :type anim_data: dict
+
+    :return: json serializable data
+    :rtype: dict
+    """
+    if curve.is_batch(anim_data):
+        data = {curve.BATCH_KEY: dict(
+            (name, _map_channels(object_data, encode_curve))
+            for name, object_data in anim_data[curve.BATCH_KEY].items())}
+    else:
+        data = _map_channels(anim_data, encode_curve)
+
+    data[VERSION_KEY] = VERSION
+    return data
+
+
+def decode(data):
+    """
+    Decodes compact json into anim_data or batch data
+
+    :param data: loaded json
+    :type data: dict
+
+    :raises: ``ValueError`` if written by a newer version
+
+    :return: dict of data or batch data
+    :rtype: dict
+    """
+    if data[VERSION_KEY] > VERSION:
+        raise ValueError(
+            "Unsupported AnimIO json version {0}".format(data[VERSION_KEY]))
+
+    if curve.is_batch(data):
+        return {curve.BATCH_KEY: dict(
+            (name, _map_channels(object_data, decode_curve))
+            for name, object_data in data[curve.BATCH_KEY].items())}
+
+    return _map_channels(data, decode_curve)
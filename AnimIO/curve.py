@@ -0,0 +1,439 @@
+from __future__ import absolute_import
+
+import operator
+from array import array
+
+# attributes captured per object
+ATTRIBUTES = ("Translation", "Rotation")
+
+# batch data stores anim_data per object LongName under this key
+BATCH_KEY = "objects"
+
+# 64 bit ints are not available to array on python 2,
+# fall back to doubles which hold ticks exactly up to ~54 hours
+try:
+    array('q')
+    TIME_TYPECODE = 'q'
+except ValueError:
+    TIME_TYPECODE = 'd'
+
+# legacy key dict name, column attribute, array typecode
+FIELDS = (
+    ('time', 'times', TIME_TYPECODE),
+    ('value', 'values', 'd'),
+    ('interpolation', 'interpolations', 'B'),
+    ('tangent-mode', 'tangent_modes', 'B'),
+    ('constant-mode', 'constant_modes', 'B'),
+    ('left-derivative', 'left_derivatives', 'd'),
+    ('right-derivative', 'right_derivatives', 'd'),
+    ('left-weight', 'left_weights', 'd'),
+    ('right-weight', 'right_weights', 'd'),
+)
+
+COLUMNS = tuple(column for _, column, _ in FIELDS)
+
+# tangent weight MotionBuilder gives new keys
+DEFAULT_WEIGHT = 1.0 / 3.0
+
+# FBTime ticks in one second
+TICKS_PER_SECOND = 46186158000
+
+
+def tangent_is_default_weight(tangent_weight):
+    """
+    Checks if tangent is equal to default value of 1/3
+
+    :param tangent_is_default_weight: value to check
+    :type tangent_is_default_weight: float
+
+    :return: If default weight
+    :rtype: bool
+    """
+    return tangent_weight > 0.3333 and tangent_weight < 0.3334
+
+
+def constant_value(column):
+    """
+    Gets the value shared by every entry of a column
+
+    :param column: column to check
+    :type column: array.array
+
+    :return: shared value or None if entries differ or column is empty
+    :rtype: int or float or NoneType
+    """
+    if column and column.count(column[0]) == len(column):
+        return column[0]
+    return None
+
+
+class CurveData(object):
+    """
+    Columnar storage of a single fcurve's keys.
+
+    Each key field is stored in its own typed array so a key costs a
+    few dozen bytes instead of a dict of nine boxed values. Static
+    channels hold a single value and no keys.
+    """
+    __slots__ = COLUMNS + ('static',)
+
+    def __init__(self, static=False):
+
+        for _, column, typecode in FIELDS:
+            setattr(self, column, array(typecode))
+
+        self.static = static
+
+    @classmethod
+    def from_static(cls, value):
+        """
+        Creates a static (unanimated) channel
+
+        :param value: value of channel
+        :type value: float
+
+        :return: static curve
+        :rtype: CurveData
+        """
+        curve = cls(static=True)
+        curve.values.append(value)
+        return curve
+
+    @classmethod
+    def from_keys(cls, key_data_list):
+        """
+        Creates curve from the legacy list of key dicts
+
+        :param key_data_list: key data ordered in time as list
+        :type key_data_list: list of dict
+
+        :return: curve
+        :rtype: CurveData
+        """
+        if key_data_list and key_data_list[0].get("static", False):
+            return cls.from_static(key_data_list[0].get("value", 0.0))
+
+        curve = cls()
+        for field, column, _ in FIELDS:
+            getattr(curve, column).extend(
+                [key_data[field] for key_data in key_data_list])
+
+        return curve
+
+    def append(self, time, value, interpolation, tangent_mode,
+               constant_mode, left_derivative, right_derivative,
+               left_weight, right_weight):
+        """
+        Appends a key to the end of the curve
+        """
+        self.times.append(time)
+        self.values.append(value)
+        self.interpolations.append(interpolation)
+        self.tangent_modes.append(tangent_mode)
+        self.constant_modes.append(constant_mode)
+        self.left_derivatives.append(left_derivative)
+        self.right_derivatives.append(right_derivative)
+        self.left_weights.append(left_weight)
+        self.right_weights.append(right_weight)
+
+    def take(self, indices):
+        """
+        Creates a curve from a subset of keys
+
+        :param indices: key indices to keep, in order
+        :type indices: list of int
+
+        :return: curve
+        :rtype: CurveData
+        """
+        taken = type(self)(static=self.static)
+        if self.static:
+            taken.values.append(self.values[0])
+            return taken
+
+        for column in COLUMNS:
+            values = getattr(self, column)
+            setattr(taken, column, array(
+                values.typecode, [values[i] for i in indices]))
+
+        return taken
+
+    def is_sorted(self):
+        """
+        Checks if keys are in strictly increasing time order
+
+        :return: If sorted
+        :rtype: bool
+        """
+        # equal length inputs, python 2 map pads the shorter with None
+        times = self.times
+        return all(map(operator.lt, times[:-1], times[1:]))
+
+    def sorted(self):
+        """
+        Gets the curve with its keys in strictly increasing time order
+
+        Of keys sharing a time only the last in the curve is kept.
+
+        :return: self if already sorted, otherwise a sorted curve
+        :rtype: CurveData
+        """
+        if self.static or self.is_sorted():
+            return self
+
+        # sort is stable, so the last key of each time ends up last
+        times = self.times
+        order = sorted(range(len(self)), key=times.__getitem__)
+        last = len(order) - 1
+        return self.take([
+            index for position, index in enumerate(order)
+            if position == last or
+            times[index] != times[order[position + 1]]])
+
+    def copy(self):
+        """
+        Creates a curve with its own copy of every column
+
+        :return: curve
+        :rtype: CurveData
+        """
+        copied = type(self)(static=self.static)
+        for column in COLUMNS:
+            setattr(copied, column, getattr(self, column)[:])
+
+        return copied
+
+    @property
+    def nbytes(self):
+        """
+        Memory used by the key columns in bytes
+
+        :return: byte count
+        :rtype: int
+        """
+        return sum(
+            len(getattr(self, column)) * getattr(self, column).itemsize
+            for column in COLUMNS)
+
+    def to_keys(self):
+        """
+        Converts curve to the legacy list of key dicts
+
+        :return: list of curve data
+        :rtype: list of dict
+        """
+        if self.static:
+            return [self[0]]
+        return [self[i] for i in range(len(self))]
+
+    def __getstate__(self):
+        return dict((slot, getattr(self, slot)) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, index):
+        """
+        Compatibility view of a single key as a legacy key dict
+        """
+        if self.static:
+            if index not in (0, -1):
+                raise IndexError("Static curve only has index 0")
+            return {"value": self.values[0], "static": True}
+
+        key_data = {}
+        for field, column, _ in FIELDS:
+            key_data[field] = getattr(self, column)[index]
+
+        # ticks are written as ints where the column holds doubles
+        key_data["time"] = int(key_data["time"])
+        return key_data
+
+    def __eq__(self, other):
+        if not isinstance(other, CurveData):
+            return NotImplemented
+
+        return self.static == other.static and all(
+            getattr(self, column) == getattr(other, column)
+            for column in COLUMNS)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __repr__(self):
+        if self.static:
+            return "CurveData(static={0})".format(self.values[0])
+        return "CurveData(keys={0})".format(len(self))
+
+
+def as_curve(data):
+    """
+    Converts data to CurveData if needed
+
+    :param data: curve or legacy list of key dicts
+    :type data: CurveData or list of dict
+
+    :return: curve
+    :rtype: CurveData
+    """
+    if isinstance(data, CurveData):
+        return data
+    return CurveData.from_keys(data)
+
+
+def is_batch(anim_data):
+    """
+    Checks if data holds animation of multiple objects
+
+    :param anim_data: dict of data or batch data
+    :type anim_data: dict
+
+    :return: If batch data
+    :rtype: bool
+    """
+    return BATCH_KEY in anim_data
+
+
+def load_animdata(anim_data):
+    """
+    Converts the channels of anim_data to CurveData
+
+    :param anim_data: dict of data or batch data
+    :type anim_data: dict
+
+    :return: dict of data with CurveData channels
+    :rtype: dict
+    """
+    loaded = dict(anim_data)
+
+    if is_batch(loaded):
+        loaded[BATCH_KEY] = dict(
+            (name, load_animdata(object_data))
+            for name, object_data in loaded[BATCH_KEY].items())
+        return loaded
+
+    for attribute in ATTRIBUTES:
+        if attribute in loaded:
+            loaded[attribute] = [
+                as_curve(channel) for channel in loaded[attribute]]
+
+    return loaded
+
+
+def set_channel(anim_data, name, attribute, index, curve_data):
+    """
+    Sets a channel of anim_data, adding it if index is past the end
+
+    :param anim_data: dict of data or batch data, changed in place
+    :type anim_data: dict
+
+    :param name: object name in batch data, empty for dict of data
+    :type name: str
+
+    :param attribute: "Translation" or "Rotation"
+    :type attribute: str
+
+    :param index: channel index
+    :type index: int
+
+    :param curve_data: channel
+    :type curve_data: CurveData
+    """
+    if name:
+        anim_data = anim_data[BATCH_KEY].setdefault(name, {})
+
+    channels = anim_data.setdefault(attribute, [])
+    if index < len(channels):
+        channels[index] = curve_data
+    else:
+        channels.append(curve_data)
+
+
+def animdata_nbytes(anim_data):
+    """
+    Estimates memory used by the key columns of anim_data
+
+    :param anim_data: dict of data or batch data
+    :type anim_data: dict
+
+    :return: byte count
+    :rtype: int
+    """
+    if is_batch(anim_data):
+        return sum(animdata_nbytes(object_data)
+                   for object_data in anim_data[BATCH_KEY].values())
+
+    return sum(as_curve(channel).nbytes
+               for attribute in ATTRIBUTES
+               for channel in anim_data.get(attribute, []))
+
+
+def offset_times(times, offset):
+    """
+    Shifts a whole time column by an offset in ticks
+
+    :param times: time column
+    :type times: array.array
+
+    :param offset: offset in ticks
+    :type offset: int
+
+    :return: shifted column, times itself if offset is 0
+    :rtype: array.array
+    """
+    if not offset or not times:
+        return times
+
+    # offset stays an int so it adds to int and double columns alike
+    return array(times.typecode, [time + offset for time in times])
+
+
+def copy_animdata(anim_data):
+    """
+    Copies anim_data so changes to the copy leave the original untouched
+
+    Columns are copied as whole arrays, far cheaper than parsing again.
+
+    :param anim_data: dict of data or batch data
+    :type anim_data: dict
+
+    :return: dict of data or batch data
+    :rtype: dict
+    """
+    copied = dict(anim_data)
+
+    if is_batch(copied):
+        copied[BATCH_KEY] = dict(
+            (name, copy_animdata(object_data))
+            for name, object_data in copied[BATCH_KEY].items())
+        return copied
+
+    for attribute in ATTRIBUTES:
+        if attribute in copied:
+            copied[attribute] = [
+                as_curve(channel).copy() for channel in copied[attribute]]
+
+    return copied
+
+
+def json_default(obj):
+    """
+    json ``default`` hook writing CurveData as legacy key dicts
+
+    :param obj: object json could not serialize
+    :type obj: object
+
+    :return: serializable data
+    :rtype: list of dict
+    """
+    if isinstance(obj, CurveData):
+        return obj.to_keys()
+
+    raise TypeError("{0!r} is not JSON serializable".format(obj))
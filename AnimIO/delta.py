@@ -0,0 +1,284 @@
+"""
+Incremental export of changed channels
+
+An incremental export writes the full file once together with a sidecar
+manifest holding a digest of every channel. Later exports to the same
+path only write the channels whose digest changed to a patch file next
+to it::
+
+    shot.aio            base file, any format
+    shot.aio.manifest   digests, base size and mtime, patch list
+    shot.aio.patch1     changed channels in compact json
+
+read_file applies the patches listed in the manifest over the base. The
+manifest is ignored if the base was rewritten by anything else since.
+"""
+from __future__ import absolute_import
+
+import hashlib
+import json
+import os
+
+from AnimIO import LOG
+from AnimIO import binary
+from AnimIO import cache
+from AnimIO import compact
+from AnimIO import curve
+
+VERSION = 1
+
+MANIFEST_SUFFIX = ".manifest"
+PATCH_SUFFIX = ".patch"
+
+# patches written before the next export rewrites the base
+MAX_PATCHES = 8
+
+
+def manifest_path(file_path):
+    """
+    Gets the path of the sidecar manifest of file_path
+
+    :param file_path: path of base file
+    :type file_path: str
+
+    :return: path of manifest
+    :rtype: str
+    """
+    return file_path + MANIFEST_SUFFIX
+
+
+def channel_digest(curve_data):
+    """
+    Hashes a channel as packed for the binary format, the same bytes on
+    python 2 and 3 and on either byte order
+
+    :param curve_data: channel to hash
+    :type curve_data: AnimIO.curve.CurveData
+
+    :return: hex digest
+    :rtype: str
+    """
+    return hashlib.sha1(binary.pack_channel(curve_data)).hexdigest()
+
+
+def channel_digests(anim_data):
+    """
+    Hashes every channel of anim_data
+
+    :param anim_data: dict of data or batch data
+    :type anim_data: dict
+
+    :return: digest per (object name, attribute, index)
+    :rtype: dict
+    """
+    return dict(
+        ((name, attribute, index), channel_digest(curve_data))
+        for name, attribute, index, curve_data in
+        binary.iter_channels(anim_data))
+
+
+def _base_stat(file_path):
+    _, size, mtime = cache.file_key(file_path)
+    return [size, mtime]
+
+
+def read_manifest(file_path):
+    """
+    Reads the manifest of file_path if it still matches the base file
+
+    :param file_path: path of base file
+    :type file_path: str
+
+    :return: manifest or None if missing or out of date
+    :rtype: dict or NoneType
+    """
+    path = manifest_path(file_path)
+    if not os.path.isfile(path) or not os.path.isfile(file_path):
+        return None
+
+    with open(path, "r") as read_file:
+        manifest = json.load(read_file)
+
+    if manifest.get("version", 0) > VERSION:
+        raise ValueError(
+            "Unsupported AnimIO manifest version {0}".format(
+                manifest["version"]))
+
+    if manifest["base"] != _base_stat(file_path):
+        LOG.warning("{0} changed since its manifest was written, "
+                    "ignoring patches.".format(file_path))
+        return None
+
+    manifest["digests"] = dict(
+        ((name, attribute, index), digest)
+        for name, attribute, index, digest in manifest["digests"])
+    return manifest
+
+
+def _write_manifest(file_path, format, digests, patches):
+    manifest = {
+        "version": VERSION,
+        "format": format,
+        "base": _base_stat(file_path),
+        "patches": patches,
+        "digests": sorted(
+            [name, attribute, index, digest]
+            for (name, attribute, index), digest in digests.items())}
+
+    with open(manifest_path(file_path), "w") as write_file:
+        json.dump(manifest, write_file, separators=compact.SEPARATORS)
+
+
+def start(file_path, format, anim_data):
+    """
+    Writes a fresh manifest for a base file that was just written
+
+    :param file_path: path of base file
+    :type file_path: str
+
+    :param format: format of base file
+    :type format: str
+
+    :param anim_data: data written to the base file
+    :type anim_data: dict
+    """
+    remove(file_path)
+    _write_manifest(file_path, format, channel_digests(anim_data), [])
+
+
+def write_patch(file_path, anim_data, format):
+    """
+    Writes the channels changed since the last export as a patch
+
+    Nothing is written when no channel changed. Patching is refused when
+    there is no usable manifest, the format changed, channels were
+    removed or too many patches piled up, the base should then be
+    rewritten.
+
+    :param file_path: path of base file
+    :type file_path: str
+
+    :param anim_data: dict of data or batch data
+    :type anim_data: dict
+
+    :param format: format of base file
+    :type format: str
+
+    :return: If anim_data is now stored by base plus patches
+    :rtype: bool
+    """
+    manifest = read_manifest(file_path)
+    if manifest is None or manifest["format"] != format:
+        return False
+
+    if len(manifest["patches"]) >= MAX_PATCHES:
+        return False
+
+    digests = channel_digests(anim_data)
+    if set(manifest["digests"]) - set(digests):
+        return False
+
+    changed = sorted(
+        key for key, digest in digests.items()
+        if manifest["digests"].get(key) != digest)
+
+    if not changed:
+        LOG.info("No channels changed since last export of {0}".format(
+            file_path))
+        return True
+
+    patch_name = "{0}{1}{2}".format(
+        os.path.basename(file_path), PATCH_SUFFIX,
+        len(manifest["patches"]) + 1)
+
+    channels = dict(
+        ((name, attribute, index), curve_data)
+        for name, attribute, index, curve_data in
+        binary.iter_channels(anim_data))
+
+    with open(os.path.join(os.path.dirname(file_path), patch_name),
+              "w") as write_file:
+        json.dump(
+            {compact.VERSION_KEY: VERSION,
+             "channels": [
+                 [name, attribute, index,
+                  compact.encode_curve(channels[(name, attribute, index)])]
+                 for name, attribute, index in changed]},
+            write_file, separators=compact.SEPARATORS)
+
+    _write_manifest(
+        file_path, format, digests, manifest["patches"] + [patch_name])
+
+    LOG.info("Wrote {0} changed channels of {1} to {2}".format(
+        len(changed), file_path, patch_name))
+    return True
+
+
+def read_patches(file_path, manifest):
+    """
+    Reads the channels written by the patches of a manifest
+
+    :param file_path: path of base file
+    :type file_path: str
+
+    :param manifest: manifest from read_manifest
+    :type manifest: dict
+
+    :return: latest channel per (object name, attribute, index)
+    :rtype: dict
+    """
+    directory = os.path.dirname(file_path)
+
+    channels = {}
+    for patch_name in manifest["patches"]:
+        with open(os.path.join(directory, patch_name), "r") as read_file:
+            patch = json.load(read_file)
+
+        for name, attribute, index, channel in patch["channels"]:
+            channels[(name, attribute, index)] = \
+                compact.decode_curve(channel)
+
+    return channels
+
+
+def apply_patches(file_path, anim_data, manifest):
+    """
+    Applies the patches of a manifest over data read from the base file
+
+    :param file_path: path of base file
+    :type file_path: str
+
+    :param anim_data: data read from the base file, changed in place
+    :type anim_data: dict
+
+    :param manifest: manifest from read_manifest
+    :type manifest: dict
+
+    :return: anim_data
+    :rtype: dict
+    """
+    for (name, attribute, index), curve_data in \
+            read_patches(file_path, manifest).items():
+        curve.set_channel(anim_data, name, attribute, index, curve_data)
+
+    return anim_data
+
+
+def remove(file_path):
+    """
+    Deletes the manifest and patches of file_path if any
+    """
+    path = manifest_path(file_path)
+    if not os.path.isfile(path):
+        return
+
+    with open(path, "r") as read_file:
+        patches = json.load(read_file).get("patches", [])
+
+    directory = os.path.dirname(file_path)
+    for patch_name in patches:
+        patch_path = os.path.join(directory, patch_name)
+        if os.path.isfile(patch_path):
+            os.remove(patch_path)
+
+    os.remove(path)
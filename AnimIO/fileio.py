@@ -0,0 +1,323 @@
+"""
+Reading and writing of animation files
+
+Kept free of pyfbsdk so files can be read and written outside
+MotionBuilder, e.g. in worker processes.
+"""
+from __future__ import absolute_import
+
+import bz2
+import gzip
+import json
+import sys
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+from AnimIO import LOG
+from AnimIO import binary
+from AnimIO import cache
+from AnimIO import compact
+from AnimIO import curve
+from AnimIO import delta
+from AnimIO import store
+
+FORMATS = ("json", "compact", "binary")
+
+# file extension per compression
+COMPRESSIONS = {"gzip": ".gz", "bz2": ".bz2", "lzma": ".xz"}
+
+# default memory budget of parsed files kept by read_file
+CACHE_BYTES = 256 * 1024 * 1024
+
+CACHE = cache.LRUCache(CACHE_BYTES, curve.animdata_nbytes)
+
+
+def split_compression(file_path):
+    """
+    Splits the compression extension off file_path
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :return: path without compression extension and compression or None
+    :rtype: tuple of (str, str or NoneType)
+    """
+    for compression, extension in COMPRESSIONS.items():
+        if file_path.endswith(extension):
+            return file_path[:-len(extension)], compression
+
+    return file_path, None
+
+
+def open_file(file_path, mode="r", compression=None):
+    """
+    Opens a file, compressing or decompressing as it is streamed
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :param mode: "r", "w", "rb" or "wb"
+    :type mode: str
+
+    :param compression: "gzip", "bz2" or "lzma", picked from extension
+                        if None
+    :type compression: str or NoneType
+
+    :raises: ``ValueError`` if compression is unknown or unavailable
+
+    :return: file object
+    :rtype: file
+    """
+    if compression is None:
+        compression = split_compression(file_path)[1]
+
+    if compression is None:
+        return open(file_path, mode)
+
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            "Unknown compression {0}! Expected one of {1}".format(
+                compression, ", ".join(sorted(COMPRESSIONS))))
+
+    # python 2 compressed files are bytes only, which str already is
+    if "b" not in mode:
+        mode += "t" if sys.version_info[0] >= 3 else "b"
+
+    if compression == "gzip":
+        return gzip.open(file_path, mode)
+
+    if compression == "bz2":
+        return getattr(bz2, "open", bz2.BZ2File)(file_path, mode)
+
+    if lzma is None:
+        raise ValueError("lzma compression needs python 3!")
+
+    return lzma.open(file_path, mode)
+
+
+def is_binary(file_path):
+    """
+    Checks magic bytes of a file, decompressing it if needed
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :return: If file is a binary animation file
+    :rtype: bool
+    """
+    with open_file(file_path, "rb") as read_file:
+        return read_file.read(len(binary.MAGIC)) == binary.MAGIC
+
+
+def write_file(file_path, anim_data, format=None, incremental=False,
+               compression=None):
+    """
+    Writes anim_data to file in json, compact json or binary format
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :param anim_data: dict of data
+    :type anim_data: dict
+
+    :param format: "json", "compact" or "binary", picked from extension
+                   if None
+    :type format: str or NoneType
+
+    :param incremental: only write channels changed since the last
+                        incremental export to file_path as a patch, see
+                        AnimIO.delta
+    :type incremental: bool
+
+    :param compression: "gzip", "bz2" or "lzma", picked from extension
+                        like .json.gz if None
+    :type compression: str or NoneType
+
+    :raises: ``ValueError`` if format or compression is unknown
+
+    :return: path written, with extension added if needed
+    :rtype: str
+    """
+    file_path, path_compression = split_compression(file_path)
+    compression = compression or path_compression
+
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(
+            "Unknown compression {0}! Expected one of {1}".format(
+                compression, ", ".join(sorted(COMPRESSIONS))))
+
+    if format is None:
+        if file_path.endswith(binary.EXTENSION):
+            format = "binary"
+        else:
+            format = "json"
+
+    if format not in FORMATS:
+        raise ValueError("Unknown format {0}! Expected one of {1}".format(
+            format, ", ".join(FORMATS)))
+
+    extension = binary.EXTENSION if format == "binary" else ".json"
+    if not file_path.endswith(extension):
+        file_path += extension
+
+    if compression is not None:
+        file_path += COMPRESSIONS[compression]
+
+    if incremental and delta.write_patch(file_path, anim_data, format):
+        return file_path
+
+    if format == "binary":
+        with open_file(file_path, "wb", compression) as write_file:
+            binary.write(write_file, anim_data)
+
+    elif format == "compact":
+        with open_file(file_path, "w", compression) as write_file:
+            json.dump(compact.encode(anim_data), write_file, sort_keys=True,
+                      separators=compact.SEPARATORS)
+
+    else:
+        with open_file(file_path, "w", compression) as write_file:
+            json.dump(anim_data, write_file, sort_keys=True, indent=4,
+                      default=curve.json_default)
+
+    # patches of earlier incremental exports no longer apply
+    if incremental:
+        delta.start(file_path, format, anim_data)
+    else:
+        delta.remove(file_path)
+
+    LOG.info("Successfully wrote animation data to {0}".format(file_path))
+    return file_path
+
+
+def parse_file(file_path):
+    """
+    Parses a json, compact json, binary file or clip manifest, bypassing
+    the cache
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :return: anim_data
+    :rtype: dict
+    """
+    if store.is_manifest(file_path):
+        anim_data = store.read(file_path)
+
+    elif is_binary(file_path):
+        with open_file(file_path, "rb") as read_file:
+            anim_data = binary.read(read_file)
+
+    else:
+        with open_file(file_path, "r") as read_file:
+            anim_data = json.load(read_file)
+
+        if compact.is_compact(anim_data):
+            anim_data = compact.decode(anim_data)
+        else:
+            anim_data = curve.load_animdata(anim_data)
+
+    LOG.info("Successfully read animation data from {0}".format(file_path))
+    return anim_data
+
+
+def _parse_patched(file_path, manifest):
+    anim_data = parse_file(file_path)
+    if manifest is not None:
+        anim_data = delta.apply_patches(file_path, anim_data, manifest)
+    return anim_data
+
+
+def read_file(file_path, lazy=False, cached=True):
+    """
+    Reads anim_data from a json, compact json, binary file or clip
+    manifest of an AnimIO.store.ClipStore
+
+    Parsed files are kept in ``CACHE`` keyed by path, size and
+    modification time, so reading an unchanged file again only copies
+    its columns. Every call returns its own copy, changing it leaves the
+    cache untouched.
+
+    Files ending in .gz, .bz2 or .xz are decompressed as they are read.
+    Patches of incremental exports are applied over the file. Compressed
+    binary files and binary files with patches are read in full even
+    when lazy is set.
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :param lazy: memory map binary files and read channels on access
+    :type lazy: bool
+
+    :param cached: use the parsed file cache
+    :type cached: bool
+
+    :return: anim_data
+    :rtype: dict or AnimIO.binary.LazyAnimData
+    """
+    manifest = delta.read_manifest(file_path)
+
+    if lazy and manifest is None and binary.is_binary(file_path):
+        anim_data = binary.LazyAnimData(file_path)
+        LOG.info("Mapped animation data from {0}".format(file_path))
+        return anim_data
+
+    if not cached:
+        return _parse_patched(file_path, manifest)
+
+    anim_data, shared = load_cached(file_path, manifest)
+    if shared:
+        return curve.copy_animdata(anim_data)
+    return anim_data
+
+
+def load_cached(file_path, manifest=None):
+    """
+    Gets parsed anim_data from the cache, parsing it into the cache first
+    if needed
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :param manifest: manifest of file_path from delta.read_manifest
+    :type manifest: dict or NoneType
+
+    :return: anim_data and whether it is held by the cache, shared data
+             must be copied before it is changed
+    :rtype: tuple of (dict, bool)
+    """
+    key = cache.file_key(file_path)
+    if manifest is not None:
+        # patches are listed in the manifest so it changes with them
+        key += cache.file_key(delta.manifest_path(file_path))
+
+    anim_data = CACHE.get(key)
+    if anim_data is not None:
+        LOG.info("Read cached animation data of {0}".format(file_path))
+        return anim_data, True
+
+    anim_data = _parse_patched(file_path, manifest)
+    return anim_data, CACHE.put(key, anim_data)
+
+
+def cache_stats():
+    """
+    Gets statistics of the parsed file cache
+
+    :return: hits, misses, entries, nbytes and max_bytes
+    :rtype: dict
+    """
+    return CACHE.stats()
+
+
+def set_cache_size(max_bytes):
+    """
+    Changes the memory budget of the parsed file cache, 0 disables it
+
+    :param max_bytes: size budget in bytes
+    :type max_bytes: int
+    """
+    CACHE.resize(max_bytes)
@@ -0,0 +1,231 @@
+"""
+Incremental json reading and writing of animation data
+
+Uses the same schema as ``json.dump`` of an anim_data dict but handles one
+key or channel at a time so the full animation never has to be in memory.
+"""
+from __future__ import absolute_import
+
+import json
+
+from AnimIO import compact
+from AnimIO import curve
+
+ENCODER = json.JSONEncoder(sort_keys=True, default=curve.json_default)
+DECODER = json.JSONDecoder()
+
+CHUNK_SIZE = 1 << 16
+
+WHITESPACE = " \t\n\r"
+
+
+def write(write_file, attributes):
+    """
+    Writes channels to an open text file one key at a time
+
+    :param write_file: file opened for text writing
+    :type write_file: file
+
+    :param attributes: attribute name to iterable of channels, each
+                       channel an iterable of key dicts
+    :type attributes: dict
+
+    :return: number of keys written
+    :rtype: int
+    """
+    encode = ENCODER.encode
+    key_count = 0
+
+    write_file.write("{")
+    for i, attribute in enumerate(sorted(attributes)):
+        write_file.write(",\n    " if i else "\n    ")
+        write_file.write(encode(attribute) + ": [")
+
+        for j, keys in enumerate(attributes[attribute]):
+            write_file.write(",\n        [" if j else "\n        [")
+
+            for k, key_data in enumerate(keys):
+                write_file.write(",\n            " if k else "\n            ")
+                write_file.write(encode(key_data))
+                key_count += 1
+
+            write_file.write("\n        ]")
+
+        write_file.write("\n    ]")
+    write_file.write("\n}\n")
+
+    return key_count
+
+
+class _Reader(object):
+    """
+    Buffered character reader that decodes one json value at a time
+    """
+    def __init__(self, read_file, chunk_size=CHUNK_SIZE):
+        self.read_file = read_file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size=0):
+        """
+        Reads the next chunk, dropping consumed text
+
+        :param size: minimum number of characters to read
+        :type size: int
+
+        :return: If more text was read
+        :rtype: bool
+        """
+        if self.eof:
+            return False
+
+        chunk = self.read_file.read(max(size, self.chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Skips whitespace and returns the next character
+
+        :return: next character or empty string at end of file
+        :rtype: str
+        """
+        while True:
+            while self.pos < len(self.buffer) and \
+                    self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, chars):
+        """
+        Consumes the next character, which must be one of chars
+
+        :raises: ``ValueError`` if another character is found
+
+        :return: consumed character
+        :rtype: str
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(
+                "Expected one of {0!r} at {1!r}".format(
+                    chars, self.buffer[self.pos:self.pos + 20]))
+
+        self.pos += 1
+        return char
+
+    def value(self):
+        """
+        Decodes the next json value
+
+        Refills until the value is complete, a value ending exactly at the
+        end of the buffer may be a truncated number so it is retried too.
+        Each refill at least doubles the pending text so large values
+        decode in linear time.
+
+        :return: decoded value
+        :rtype: object
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if not self.fill(len(self.buffer) - self.pos):
+                    raise
+                continue
+
+            if end == len(self.buffer) and \
+                    self.fill(len(self.buffer) - self.pos):
+                continue
+
+            self.pos = end
+            return value
+
+    def items(self):
+        """
+        Yields the keys of a json object, the caller consumes each value
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+
+            if self.expect(",}") == "}":
+                return
+
+    def elements(self):
+        """
+        Yields for each element of a json array, the caller consumes it
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield
+
+            if self.expect(",]") == "]":
+                return
+
+
+def _iter_attribute(reader, name, attribute):
+    for index, _ in enumerate(reader.elements()):
+        if reader.peek() == "{":
+            # compact schema channel of field arrays
+            yield name, attribute, index, compact.decode_curve(
+                reader.value())
+        else:
+            key_data_list = [reader.value() for _ in reader.elements()]
+            yield name, attribute, index, key_data_list
+
+
+def _iter_object(reader, name, top_level=False):
+    for key in reader.items():
+        if key in curve.ATTRIBUTES:
+            for channel in _iter_attribute(reader, name, key):
+                yield channel
+
+        elif key == curve.BATCH_KEY and top_level:
+            for object_name in reader.items():
+                for channel in _iter_object(reader, object_name):
+                    yield channel
+
+        else:
+            reader.value()
+
+
+def iter_channels(read_file, chunk_size=CHUNK_SIZE):
+    """
+    Yields channels of a json animation file as they are parsed
+
+    Only one channel's keys are held in memory at a time. Both the
+    original and compact schemas are accepted, compact channels are
+    yielded as CurveData.
+
+    :param read_file: file opened for text reading
+    :type read_file: file
+
+    :param chunk_size: characters read at a time
+    :type chunk_size: int
+
+    :return: generator of (object name, attribute, index, key data list
+             or CurveData), object name is empty for single object files
+    :rtype: generator
+    """
+    return _iter_object(_Reader(read_file, chunk_size), "", top_level=True)
@@ -0,0 +1,82 @@
+"""
+Tables converting key mode columns between pyfbsdk enums and codes
+
+CurveData stores interpolation, tangent and constant modes as small int
+codes. Each table resolves its codes to the interned enum objects once,
+then converts whole columns at a time for set_curve_data, while
+get_curve_data packs the enums it reads back into codes in one call.
+"""
+from __future__ import absolute_import
+
+import itertools
+from array import array
+
+import pyfbsdk
+
+from AnimIO import curve
+
+# array typecode of mode columns
+MODE_TYPECODE = 'B'
+
+
+class ModeTable(object):
+    """
+    Code to enum lookups of one pyfbsdk enum type
+
+    :param enum_type: pyfbsdk enum type
+    :type enum_type: type
+
+    :param replace: code to code substitutions applied when resolving
+    :type replace: dict or NoneType
+    """
+    def __init__(self, enum_type, replace=None):
+        replace = replace or {}
+
+        self.enum_type = enum_type
+        self.enums = dict(
+            (code, enum_type.values[replace.get(code, code)])
+            for code in enum_type.values)
+
+        # code each code ends up as once resolved
+        self.resolved = dict(
+            (code, int(enum)) for code, enum in self.enums.items())
+
+    def to_enums(self, column):
+        """
+        Resolves a column of codes to enums
+
+        :param column: mode codes
+        :type column: array.array
+
+        :return: enum per key
+        :rtype: iterable
+        """
+        code = curve.constant_value(column)
+        if code is not None:
+            return itertools.repeat(self.enums[code], len(column))
+
+        return map(self.enums.__getitem__, column)
+
+    def to_codes(self, enums):
+        """
+        Packs a column of enums into codes
+
+        :param enums: enum per key
+        :type enums: list of pyfbsdk enums
+
+        :return: mode codes
+        :rtype: array.array
+        """
+        # enums are ints so array converts the whole column in C
+        return array(MODE_TYPECODE, enums)
+
+
+INTERPOLATION = ModeTable(pyfbsdk.FBInterpolation)
+
+# not using TCB mode just set to break
+TANGENT_MODE = ModeTable(
+    pyfbsdk.FBTangentMode,
+    {int(pyfbsdk.FBTangentMode.kFBTangentModeTCB):
+        int(pyfbsdk.FBTangentMode.kFBTangentModeBreak)})
+
+CONSTANT_MODE = ModeTable(pyfbsdk.FBTangentConstantMode)
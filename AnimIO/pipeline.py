@@ -0,0 +1,168 @@
+"""
+Parallel export of many objects
+
+Curves are captured on the main thread since pyfbsdk is not thread safe,
+then encoding and writing of each object's file is handed to a process
+pool. At most ``max_pending`` captured objects wait on the pool so memory
+stays bounded however many objects are exported.
+"""
+from __future__ import absolute_import
+
+import multiprocessing
+import os
+import re
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
+from AnimIO import LOG
+from AnimIO import api
+from AnimIO import fileio
+
+
+def file_name(long_name):
+    """
+    Converts a LongName to a file name
+
+    :param long_name: LongName of object
+    :type long_name: str
+
+    :return: file name without extension
+    :rtype: str
+    """
+    return re.sub(r"[^\w.-]", "_", long_name)
+
+
+def unique_file_names(items):
+    """
+    Converts the LongNames of items to file names no two items share
+
+    Names that only differ in replaced characters or case, like ``A:B``
+    and ``a_B``, would otherwise be written to the same file by two
+    workers at once. Later items get a numbered suffix instead.
+
+    :param items: items to export
+    :type items: list of pyfbsdk components
+
+    :return: file names without extension, in item order
+    :rtype: list of str
+    """
+    names = []
+    taken = set()
+    for item in items:
+        base = name = file_name(item.LongName)
+
+        # compare case insensitive for windows file systems
+        suffix = 1
+        while name.lower() in taken:
+            name = "{0}_{1}".format(base, suffix)
+            suffix += 1
+
+        if name != base:
+            LOG.warning("{0} exports to {1}, {2} is already used".format(
+                item.LongName, name, base))
+
+        taken.add(name.lower())
+        names.append(name)
+
+    return names
+
+
+def _iter_captured(items, directory):
+    """
+    Captures animation of each item on the calling thread
+    """
+    names = unique_file_names(items)
+
+    for index, item in enumerate(items):
+        try:
+            anim_data = api.get_animdata(item)
+        except RuntimeError as err:
+            LOG.warning(str(err))
+            continue
+
+        yield index, os.path.join(directory, names[index]), anim_data
+
+
+def export_objects(items, directory, format="binary", workers=None,
+                   max_pending=None, executable=None, compression=None):
+    """
+    Exports each item to its own file in directory
+
+    Items without animation are skipped and items whose names map to the
+    same file get a numbered suffix. Falls back to writing on the
+    calling thread when concurrent.futures is unavailable or workers is 1.
+
+    :param items: items to export
+    :type items: list of pyfbsdk components
+
+    :param directory: directory to write files to
+    :type directory: str
+
+    :param format: "json", "compact" or "binary"
+    :type format: str
+
+    :param workers: number of worker processes, defaults to cpu count
+    :type workers: int or NoneType
+
+    :param max_pending: captured objects allowed to wait on the pool,
+                        defaults to twice the workers
+    :type max_pending: int or NoneType
+
+    :param executable: python interpreter to start workers with. Inside
+                       MotionBuilder this must be its mobupy interpreter
+                       since sys.executable is the application itself.
+    :type executable: str or NoneType
+
+    :param compression: "gzip", "bz2" or "lzma" or None to not compress
+    :type compression: str or NoneType
+
+    :return: paths written, in item order
+    :rtype: list of str
+    """
+    if format not in fileio.FORMATS:
+        raise ValueError("Unknown format {0}! Expected one of {1}".format(
+            format, ", ".join(fileio.FORMATS)))
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    if max_pending is None:
+        max_pending = workers * 2
+
+    written = {}
+    captured = _iter_captured(items, directory)
+
+    if futures is None or workers < 2:
+        for index, file_path, anim_data in captured:
+            written[index] = fileio.write_file(
+                file_path, anim_data, format, compression=compression)
+
+    else:
+        if executable:
+            multiprocessing.set_executable(executable)
+
+        pending = {}
+
+        def collect(done):
+            for future in done:
+                written[pending.pop(future)] = future.result()
+
+        with futures.ProcessPoolExecutor(workers) as pool:
+            for index, file_path, anim_data in captured:
+                future = pool.submit(
+                    fileio.write_file, file_path, anim_data, format,
+                    compression=compression)
+                pending[future] = index
+
+                # wait for a slot so captured data cannot pile up
+                if len(pending) >= max_pending:
+                    collect(futures.wait(
+                        pending, return_when=futures.FIRST_COMPLETED).done)
+
+            collect(futures.wait(pending).done)
+
+    LOG.info("Exported {0} objects to {1}".format(len(written), directory))
+    return [written[index] for index in sorted(written)]
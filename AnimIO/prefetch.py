@@ -0,0 +1,181 @@
+"""
+Background parsing of animation files before they are imported
+
+The file picked in the import dialog, and optionally the clips next to
+it, are parsed on a worker thread into the ``fileio`` parsed file cache
+while the user is still choosing options so ``set_animdata`` can start as
+soon as the dialog is accepted.
+"""
+from __future__ import absolute_import
+
+import os
+import threading
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
+from AnimIO import LOG
+from AnimIO import binary
+from AnimIO import cache
+from AnimIO import curve
+from AnimIO import delta
+from AnimIO import fileio
+from AnimIO import store
+
+EXTENSIONS = tuple(
+    extension + compression
+    for extension in (".json", binary.EXTENSION)
+    for compression in [""] + sorted(fileio.COMPRESSIONS.values())) + (
+        store.EXTENSION,)
+
+
+class Prefetcher(object):
+    """
+    Parses files on a worker thread into the parsed file cache
+
+    Without concurrent.futures (python 2) prefetching is skipped and
+    ``get`` reads on the calling thread.
+
+    :param workers: number of parsing threads
+    :type workers: int
+    """
+    def __init__(self, workers=1):
+        self.cache = fileio.CACHE
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        if futures is not None:
+            self._executor = futures.ThreadPoolExecutor(workers)
+
+    def _read(self, key):
+        try:
+            return fileio.load_cached(key[0], delta.read_manifest(key[0]))
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def prefetch(self, file_path, neighbours=0):
+        """
+        Starts parsing file_path in the background
+
+        :param file_path: path of file
+        :type file_path: str
+
+        :param neighbours: number of following clips in the same
+                           directory to parse as well
+        :type neighbours: int
+        """
+        if self._executor is None:
+            return
+
+        paths = [file_path]
+        if neighbours:
+            paths.extend(neighbour_files(file_path, neighbours))
+
+        keys = []
+        for path in paths:
+            try:
+                keys.append(cache.file_key(path))
+            except OSError:
+                continue
+
+        # files highlighted before are no longer wanted
+        self._cancel(keys)
+
+        for key in keys:
+            with self._lock:
+                if key in self._pending:
+                    continue
+
+                self._pending[key] = self._executor.submit(self._read, key)
+
+            LOG.debug("Prefetching {0}".format(key[0]))
+
+    def _cancel(self, keep):
+        """
+        Cancels queued prefetches of files not in keep, parses already
+        running are left to finish
+        """
+        with self._lock:
+            for key, future in list(self._pending.items()):
+                if key not in keep and future.cancel():
+                    del self._pending[key]
+
+    def get(self, file_path):
+        """
+        Gets parsed anim_data, waiting on a running prefetch if needed
+
+        :param file_path: path of file
+        :type file_path: str
+
+        :return: anim_data
+        :rtype: dict
+        """
+        key = cache.file_key(file_path)
+
+        # do not wait behind files that were only highlighted
+        self._cancel([key])
+
+        with self._lock:
+            pending = self._pending.get(key)
+
+        if pending is None:
+            return fileio.read_file(file_path)
+
+        anim_data, shared = pending.result()
+        if shared:
+            return curve.copy_animdata(anim_data)
+        return anim_data
+
+    def shutdown(self):
+        """
+        Stops the worker threads without waiting on them
+
+        Queued prefetches are dropped, a parse already running finishes
+        in the background and only fills the cache.
+        """
+        if self._executor is None:
+            return
+
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+
+        for future in pending:
+            future.cancel()
+
+        self._executor.shutdown(wait=False)
+        self._executor = None
+
+
+def neighbour_files(file_path, count):
+    """
+    Gets animation files following file_path in its directory
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :param count: number of files to get
+    :type count: int
+
+    :return: file paths in name order
+    :rtype: list of str
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+
+    try:
+        names = sorted(
+            entry for entry in os.listdir(directory)
+            if entry.endswith(EXTENSIONS))
+    except OSError:
+        return []
+
+    if name not in names:
+        return []
+
+    index = names.index(name)
+    return [os.path.join(directory, entry)
+            for entry in names[index + 1:index + 1 + count]]
@@ -0,0 +1,175 @@
+"""
+Key reduction of captured curves
+
+Removes keys that can be rebuilt from their neighbours within a tolerance
+using a Douglas-Peucker split over each channel. Segments are evaluated
+the way MotionBuilder will interpolate them after import, so cubic keys
+are checked against the hermite spline of the kept keys' derivatives.
+"""
+from __future__ import absolute_import
+
+from AnimIO import LOG
+from AnimIO import curve
+
+# FBInterpolation codes as stored in files
+INTERPOLATION_CONSTANT = 0
+INTERPOLATION_LINEAR = 1
+
+# FBTangentMode codes as stored in files
+TANGENT_USER = 2
+TANGENT_BREAK = 3
+
+# FBTangentConstantMode codes as stored in files
+CONSTANT_NEXT = 1
+
+
+def _segment_errors(curve_data, first, last):
+    """
+    Gets the worst key between first and last and its error
+    """
+    times = curve_data.times
+    values = curve_data.values
+
+    t0 = times[first]
+    v0 = values[first]
+    v1 = values[last]
+    span = float(times[last] - t0)
+
+    interpolation = curve_data.interpolations[first]
+    if interpolation == INTERPOLATION_CONSTANT:
+        if curve_data.constant_modes[first] == CONSTANT_NEXT:
+            v0 = v1
+
+        def evaluate(s):
+            return v0
+
+    elif interpolation == INTERPOLATION_LINEAR:
+
+        def evaluate(s):
+            return v0 + (v1 - v0) * s
+
+    else:
+        # derivatives are per second, scale them to the segment length
+        seconds = span / curve.TICKS_PER_SECOND
+        m0 = curve_data.right_derivatives[first] * seconds
+        m1 = curve_data.left_derivatives[last] * seconds
+
+        def evaluate(s):
+            s2 = s * s
+            s3 = s2 * s
+            return ((2 * s3 - 3 * s2 + 1) * v0 +
+                    (s3 - 2 * s2 + s) * m0 +
+                    (-2 * s3 + 3 * s2) * v1 +
+                    (s3 - s2) * m1)
+
+    worst = None
+    worst_error = 0.0
+    for i in range(first + 1, last):
+        error = abs(values[i] - evaluate((times[i] - t0) / span))
+        if error > worst_error:
+            worst = i
+            worst_error = error
+
+    return worst, worst_error
+
+
+def reduce_curve(curve_data, tolerance):
+    """
+    Removes keys that can be interpolated from their neighbours
+
+    Kept cubic keys are switched to user tangents when they were on an
+    automatic mode, so MotionBuilder keeps the derivatives the reduction
+    was measured with instead of recomputing them from new neighbours.
+
+    :param curve_data: curve to reduce
+    :type curve_data: AnimIO.curve.CurveData or list of dict
+
+    :param tolerance: largest value difference allowed at a removed key
+    :type tolerance: float
+
+    :return: reduced curve and largest error introduced
+    :rtype: tuple of (AnimIO.curve.CurveData, float)
+    """
+    curve_data = curve.as_curve(curve_data)
+    if curve_data.static or len(curve_data) < 3:
+        return curve_data, 0.0
+
+    keep = set([0, len(curve_data) - 1])
+    max_error = 0.0
+
+    stack = [(0, len(curve_data) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        worst, error = _segment_errors(curve_data, first, last)
+        if worst is not None and error > tolerance:
+            keep.add(worst)
+            stack.append((first, worst))
+            stack.append((worst, last))
+        else:
+            max_error = max(max_error, error)
+
+    reduced = curve_data.take(sorted(keep))
+
+    if len(reduced) < len(curve_data):
+        tangent_modes = reduced.tangent_modes
+        for i, interpolation in enumerate(reduced.interpolations):
+            if interpolation not in (
+                    INTERPOLATION_CONSTANT, INTERPOLATION_LINEAR) and \
+                    tangent_modes[i] not in (TANGENT_USER, TANGENT_BREAK):
+                tangent_modes[i] = TANGENT_USER
+
+    return reduced, max_error
+
+
+def reduce_animdata(anim_data, tolerance):
+    """
+    Reduces keys on every channel of anim_data or batch data
+
+    :param anim_data: dict of data or batch data from get_animdata
+    :type anim_data: dict
+
+    :param tolerance: largest value difference allowed at a removed key
+    :type tolerance: float
+
+    :return: reduced data and a report of "keys_before", "keys_after"
+             and "max_error"
+    :rtype: tuple of (dict, dict)
+    """
+    report = {"keys_before": 0, "keys_after": 0, "max_error": 0.0}
+
+    def reduce_object(object_data):
+        reduced = dict(object_data)
+        for attribute in curve.ATTRIBUTES:
+            if attribute not in object_data:
+                continue
+
+            channels = []
+            for channel in object_data[attribute]:
+                channel = curve.as_curve(channel)
+                reduced_channel, error = reduce_curve(channel, tolerance)
+
+                report["keys_before"] += len(channel)
+                report["keys_after"] += len(reduced_channel)
+                report["max_error"] = max(report["max_error"], error)
+                channels.append(reduced_channel)
+
+            reduced[attribute] = channels
+
+        return reduced
+
+    if curve.is_batch(anim_data):
+        reduced = dict(anim_data)
+        reduced[curve.BATCH_KEY] = dict(
+            (name, reduce_object(object_data))
+            for name, object_data in anim_data[curve.BATCH_KEY].items())
+    else:
+        reduced = reduce_object(anim_data)
+
+    LOG.info(
+        "Reduced {keys_before} keys to {keys_after}, "
+        "max error {max_error:.6g}".format(**report))
+
+    return reduced, report
@@ -0,0 +1,154 @@
+"""
+Index of selected animatable components
+
+Scanning ``FBSystem().Scene.Components`` for the selection is O(scene).
+The index scans once, then follows the scene's change callbacks so
+selection queries only touch selected components.
+"""
+from __future__ import absolute_import
+
+import pyfbsdk
+
+from AnimIO import LOG
+
+_INDEX = None
+
+
+def is_animatable(comp):
+    """
+    Checks if component can be animated
+
+    :param comp: component to check
+    :type comp: pyfbsdk.FBComponent
+
+    :return: If animatable
+    :rtype: bool
+    """
+    return hasattr(comp, "Animatable")
+
+
+class SelectionIndex(object):
+    """
+    Selected animatable components, kept current by scene callbacks
+
+    :param scene: scene to index, defaults to the current scene
+    :type scene: pyfbsdk.FBScene or NoneType
+    """
+    def __init__(self, scene=None):
+        self.scene = scene or pyfbsdk.FBSystem().Scene
+        self.application = pyfbsdk.FBApplication()
+
+        self._selected = []
+        self._stale = True
+        self._connected = False
+
+        self.connect()
+
+    def connect(self):
+        """
+        Registers scene and file callbacks
+        """
+        if self._connected:
+            return
+
+        self.scene.OnChange.Add(self._on_scene_change)
+        for event in self._file_events():
+            event.Add(self._on_file_change)
+
+        self._connected = True
+
+    def disconnect(self):
+        """
+        Removes scene and file callbacks, queries then rescan the scene
+        """
+        if not self._connected:
+            return
+
+        self.scene.OnChange.Remove(self._on_scene_change)
+        for event in self._file_events():
+            event.Remove(self._on_file_change)
+
+        self._connected = False
+        self._stale = True
+
+    def _file_events(self):
+        return (self.application.OnFileNewCompleted,
+                self.application.OnFileOpenCompleted,
+                self.application.OnFileMerge)
+
+    def rebuild(self):
+        """
+        Rescans the scene for selected animatable components
+        """
+        self._selected = [
+            comp for comp in self.scene.Components
+            if comp.Selected and is_animatable(comp)]
+        self._stale = False
+
+        LOG.debug("Indexed {0} selected components".format(
+            len(self._selected)))
+
+    def _on_scene_change(self, control, event):
+        event_type = event.Type
+        comp = event.Component
+
+        if event_type == pyfbsdk.FBSceneChangeType.kFBSceneChangeSelect:
+            if is_animatable(comp) and comp not in self._selected:
+                self._selected.append(comp)
+
+        elif event_type in (
+                pyfbsdk.FBSceneChangeType.kFBSceneChangeUnselect,
+                pyfbsdk.FBSceneChangeType.kFBSceneChangeDetach,
+                pyfbsdk.FBSceneChangeType.kFBSceneChangeDestroy):
+            if comp in self._selected:
+                self._selected.remove(comp)
+
+    def _on_file_change(self, control, event):
+        # components are replaced wholesale, rescan on next query
+        self._stale = True
+
+    def selected(self, type_filters=()):
+        """
+        Gets selected animatable components in selection order
+
+        :param type_filters: class types to leave out
+        :type type_filters: iterable of str
+
+        :return: list of components
+        :rtype: list of objects
+        """
+        if self._stale or not self._connected:
+            self.rebuild()
+
+        type_filters = frozenset(type_filters)
+        if not type_filters:
+            return list(self._selected)
+
+        return [comp for comp in self._selected
+                if comp.ClassName() not in type_filters]
+
+
+def get_index():
+    """
+    Gets the shared selection index, building it on first use
+
+    :return: selection index
+    :rtype: SelectionIndex
+    """
+    global _INDEX
+
+    if _INDEX is None:
+        _INDEX = SelectionIndex()
+
+    return _INDEX
+
+
+def reset_index():
+    """
+    Disconnects and drops the shared selection index
+    """
+    global _INDEX
+
+    if _INDEX is not None:
+        _INDEX.disconnect()
+        _INDEX = None
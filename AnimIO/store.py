@@ -0,0 +1,198 @@
+"""
+Content addressed clip store
+
+Channels are packed on their own and stored once per distinct content
+under the sha1 of their bytes, so static props, locked axes and copied
+channels shared by many clips take the disk space of one. Each clip is a
+small json manifest listing the digest of every channel::
+
+    library/
+        channels/3f/3f2a...   packed channel
+        walk.aioc            {"store": ".", "channels": [[...], ...]}
+
+read_file accepts manifest paths and reassembles the clip.
+"""
+from __future__ import absolute_import
+
+import hashlib
+import json
+import os
+
+from AnimIO import LOG
+from AnimIO import binary
+from AnimIO import compact
+from AnimIO import curve
+
+VERSION = 1
+VERSION_KEY = "store_version"
+EXTENSION = ".aioc"
+
+CHANNELS_DIRECTORY = "channels"
+
+
+def is_manifest(file_path):
+    """
+    Checks if file is a clip manifest
+
+    :param file_path: path of file
+    :type file_path: str
+
+    :return: If clip manifest
+    :rtype: bool
+    """
+    return file_path.endswith(EXTENSION)
+
+
+class ClipStore(object):
+    """
+    Directory of deduplicated channels and the clips referencing them
+
+    :param root: directory of the store, created on first write
+    :type root: str
+    """
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+
+    def channel_path(self, digest):
+        """
+        Gets the path a channel is stored at
+
+        :param digest: sha1 hex digest of packed channel
+        :type digest: str
+
+        :return: path of channel
+        :rtype: str
+        """
+        return os.path.join(
+            self.root, CHANNELS_DIRECTORY, digest[:2], digest)
+
+    def put_channel(self, curve_data):
+        """
+        Stores a channel unless the same content is already stored
+
+        :param curve_data: channel to store
+        :type curve_data: AnimIO.curve.CurveData
+
+        :return: digest of channel and whether it was written
+        :rtype: tuple of (str, bool)
+        """
+        data = binary.pack_channel(curve_data)
+        digest = hashlib.sha1(data).hexdigest()
+
+        path = self.channel_path(digest)
+        if os.path.isfile(path):
+            return digest, False
+
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # made by another writer in the meantime
+                if not os.path.isdir(directory):
+                    raise
+
+        # write aside then rename so readers never see partial channels
+        temp_path = "{0}.{1}.tmp".format(path, os.getpid())
+        with open(temp_path, "wb") as write_file:
+            write_file.write(data)
+
+        try:
+            os.rename(temp_path, path)
+        except OSError:
+            os.remove(temp_path)
+            if not os.path.isfile(path):
+                raise
+
+        return digest, True
+
+    def get_channel(self, digest):
+        """
+        Reads a stored channel
+
+        :param digest: sha1 hex digest of packed channel
+        :type digest: str
+
+        :return: channel
+        :rtype: AnimIO.curve.CurveData
+        """
+        with open(self.channel_path(digest), "rb") as read_file:
+            return binary.unpack_channel(read_file.read())
+
+    def write(self, file_path, anim_data):
+        """
+        Stores the channels of anim_data and writes its clip manifest
+
+        :param file_path: path of manifest, usually inside the store
+        :type file_path: str
+
+        :param anim_data: dict of data or batch data
+        :type anim_data: dict
+
+        :return: path written, with extension added if needed
+        :rtype: str
+        """
+        if not is_manifest(file_path):
+            file_path += EXTENSION
+
+        channels = []
+        written = 0
+        for name, attribute, index, curve_data in \
+                binary.iter_channels(anim_data):
+            digest, is_new = self.put_channel(curve_data)
+            channels.append([name, attribute, index, digest])
+            written += is_new
+
+        manifest = {
+            VERSION_KEY: VERSION,
+            "batch": curve.is_batch(anim_data),
+            "store": os.path.relpath(
+                self.root, os.path.dirname(os.path.abspath(file_path))),
+            "channels": channels}
+
+        with open(file_path, "w") as write_file:
+            json.dump(manifest, write_file, sort_keys=True,
+                      separators=compact.SEPARATORS)
+
+        LOG.info("Stored {0} of {1} channels, wrote clip {2}".format(
+            written, len(channels), file_path))
+        return file_path
+
+
+def read(file_path):
+    """
+    Reassembles anim_data from a clip manifest
+
+    :param file_path: path of manifest
+    :type file_path: str
+
+    :raises: ``ValueError`` if written by a newer version
+
+    :return: dict of data or batch data
+    :rtype: dict
+    """
+    with open(file_path, "r") as read_file:
+        manifest = json.load(read_file)
+
+    if manifest[VERSION_KEY] > VERSION:
+        raise ValueError(
+            "Unsupported AnimIO store version {0}".format(
+                manifest[VERSION_KEY]))
+
+    clip_store = ClipStore(os.path.join(
+        os.path.dirname(os.path.abspath(file_path)), manifest["store"]))
+
+    anim_data = {curve.BATCH_KEY: {}} if manifest["batch"] else {}
+
+    # shared channels are read once, every use gets its own copy
+    read_channels = {}
+    for name, attribute, index, digest in manifest["channels"]:
+        if digest in read_channels:
+            curve_data = read_channels[digest].copy()
+        else:
+            curve_data = read_channels[digest] = \
+                clip_store.get_channel(digest)
+
+        curve.set_channel(anim_data, name, attribute, index, curve_data)
+
+    return anim_data
@@ -2,8 +2,10 @@ from __future__ import absolute_import
 
 import os
 from functools import partial
-from AnimIO import (api, LOG)
+from AnimIO import (api, curve, LOG)
+from AnimIO.prefetch import Prefetcher
 from AnimIO.packages.Qt import (QtWidgets, QtCore)
+from AnimIO.ui.workers import WriteTask
 
 this_package = os.path.abspath(os.path.dirname(__file__))
 this_path = partial(os.path.join, this_package)
@@ -17,8 +19,15 @@ class UI(QtWidgets.QDialog):
 
         super(UI, self).__init__(parent)
 
-        # stores our animation item
-        self.item = None
+        # stores our animation items
+        self.items = []
+
+        # keeps running write tasks alive until they report back
+        self.write_tasks = set()
+
+        # parses files picked in the import dialog ahead of time
+        self.prefetcher = Prefetcher()
+        self.prefetch_neighbours = 0
         self.default_string = "Add selected item..."
 
         self.setWindowTitle("Anim IO")
@@ -86,10 +95,16 @@ class UI(QtWidgets.QDialog):
         self.startframe_layout.addWidget(self.startframe_spnbox, 0)
         self.startframe_layout.addWidget(self.startframe_chkbox, 0)
 
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setVisible(False)
+
         self.layout.addLayout(self.obj_layout)
         self.layout.addWidget(self.import_btn)
         self.layout.addWidget(self.export_btn)
         self.layout.addLayout(self.startframe_layout)
+        self.layout.addWidget(self.progress_bar)
 
     def add_callbacks(self):
         """
@@ -107,9 +122,9 @@ class UI(QtWidgets.QDialog):
         """
         self.add_obj_btn.setToolTip(
             "Press this button to add the "
-            "currently selected animatable object.")
+            "currently selected animatable objects.")
         self.obj_line.setToolTip(
-            "Name of object to export or import animation")
+            "Name of objects to export or import animation")
 
         self.import_btn.setToolTip(
             "Press this button to import an "
@@ -122,6 +137,21 @@ class UI(QtWidgets.QDialog):
             "Optional value to set start frame of animation.")
         self.startframe_chkbox.setToolTip(
             "Check this to apply start frame value.")
+        self.progress_bar.setToolTip(
+            "Animation files still being written.")
+
+    def closeEvent(self, event):
+        """
+        Stops prefetch threads and detaches running writes from the dialog
+        """
+        self.prefetcher.shutdown()
+
+        # writes finishing after the dialog is deleted only log
+        for task in self.write_tasks:
+            task.detach()
+        self.write_tasks.clear()
+
+        super(UI, self).closeEvent(event)
 
     def toggle_startframe(self, state):
         """
@@ -146,33 +176,40 @@ class UI(QtWidgets.QDialog):
     @api.flush_output
     def add_selection(self):
         """
-        Adds selected object to ui
+        Adds selected objects to ui
         """
         current_sel = api.get_selected()
 
         if current_sel:
-            selected = current_sel[0].LongName
+            if len(current_sel) == 1:
+                selected = current_sel[0].LongName
+            else:
+                selected = "{0} objects".format(len(current_sel))
+
             self.obj_line.setText(selected)
-            self.item = current_sel[0]
-            LOG.debug("Added {0} to ui".format(selected))
+            self.items = current_sel
+            LOG.debug("Added {0} to ui".format(
+                ", ".join(item.LongName for item in current_sel)))
 
     @api.flush_output
     def import_anim(self):
         """
-        Import animation onto selected item
-        """
-        self.check_selected()
+        Import animation onto selected items
 
+        Multi object files are applied to the objects they were exported
+        from by LongName.
+        """
         file_browser = FileDialog(
             parent=self, view_mode=QtWidgets.QFileDialog.ExistingFile)
+        file_browser.currentChanged.connect(self.prefetch_file)
 
         if file_browser.exec_():
             file_names = file_browser.selectedFiles()
 
             if file_names:
 
-                # read data
-                anim_data = api.read_file(file_names[0])
+                # read data, usually already parsed by the prefetcher
+                anim_data = self.prefetcher.get(file_names[0])
 
                 # check start frame
                 start_frame = None
@@ -180,12 +217,27 @@ class UI(QtWidgets.QDialog):
                     start_frame = self.startframe_spnbox.value()
 
                 # set data
-                api.set_animdata(self.item, anim_data, start_frame)
+                if curve.is_batch(anim_data):
+                    api.set_batch_animdata(anim_data, start_frame)
+                else:
+                    self.check_selected()
+
+                    # evaluate the scene once after every item is keyed
+                    with api.import_transaction():
+                        for item in self.items:
+                            api.set_animdata(item, anim_data, start_frame)
+
+    def prefetch_file(self, file_path):
+        """
+        Starts parsing the file highlighted in the import dialog
+        """
+        if os.path.isfile(file_path):
+            self.prefetcher.prefetch(file_path, self.prefetch_neighbours)
 
     @api.flush_output
     def export_anim(self):
         """
-        Export animation onto selected item in ui
+        Export animation of items in ui to a single file
         """
         self.check_selected()
 
@@ -195,8 +247,61 @@ class UI(QtWidgets.QDialog):
             file_names = file_browser.selectedFiles()
 
             if file_names:
-                anim_data = api.get_animdata(self.item)
-                api.write_file(file_names[0], anim_data)
+                # capture on the main thread, pyfbsdk is not thread safe
+                if len(self.items) == 1:
+                    anim_data = api.get_animdata(self.items[0])
+                else:
+                    anim_data = api.get_batch_animdata(self.items)
+
+                self.start_write(file_names[0], anim_data)
+
+    def start_write(self, file_path, anim_data):
+        """
+        Writes anim_data on a worker thread so the dialog stays responsive
+        """
+        task = WriteTask(file_path, anim_data)
+        task.signals.finished.connect(
+            lambda path: self.write_done(task, path))
+        task.signals.failed.connect(
+            lambda error: self.write_failed(task, error))
+
+        self.write_tasks.add(task)
+        self.update_progress()
+
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    def write_done(self, task, file_path):
+        """
+        Called on the main thread when a write task finishes
+        """
+        # result queued before the dialog closed and dropped its tasks
+        if task not in self.write_tasks:
+            return
+
+        self.write_tasks.discard(task)
+        self.update_progress()
+
+        LOG.info("Export finished: {0}".format(file_path))
+
+    def write_failed(self, task, error):
+        """
+        Called on the main thread when a write task fails
+        """
+        if task not in self.write_tasks:
+            return
+
+        self.write_tasks.discard(task)
+        self.update_progress()
+
+        QtWidgets.QMessageBox.warning(
+            self, "Export Failed", "Could not write animation:\n{0}".format(
+                error))
+
+    def update_progress(self):
+        """
+        Shows the busy indicator while writes are running
+        """
+        self.progress_bar.setVisible(bool(self.write_tasks))
 
     @api.flush_output
     def check_selected(self):
@@ -219,6 +324,9 @@ class FileDialog(QtWidgets.QFileDialog):
 
         super(FileDialog, self).__init__(parent)
 
-        self.setNameFilter("JSON (*.json)")
+        self.setNameFilters(
+            ["Animation (*.json *.aio *.aioc *.gz *.bz2 *.xz)",
+             "JSON (*.json)", "Binary (*.aio)", "Clip Store (*.aioc)",
+             "Compressed (*.gz *.bz2 *.xz)"])
         self.setFileMode(view_mode)
         self.setViewMode(QtWidgets.QFileDialog.Detail)
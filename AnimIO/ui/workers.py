@@ -0,0 +1,92 @@
+from __future__ import absolute_import
+
+import threading
+
+from AnimIO import (fileio, LOG)
+from AnimIO.packages.Qt import QtCore
+
+# tasks still writing after their dialog closed, kept alive until done
+DETACHED_TASKS = set()
+
+
+class WorkerSignals(QtCore.QObject):
+    """
+    Signals emitted by worker tasks, QRunnable can not emit itself
+    """
+    finished = QtCore.Signal(str)
+    failed = QtCore.Signal(str)
+
+
+class WriteTask(QtCore.QRunnable):
+    """
+    Writes captured anim_data to file on a thread pool thread
+
+    Only file writing happens here, capture must stay on the main thread
+    since pyfbsdk is not thread safe.
+    """
+    def __init__(self, file_path, anim_data, format=None):
+
+        super(WriteTask, self).__init__()
+
+        self.file_path = file_path
+        self.anim_data = anim_data
+        self.format = format
+        self.signals = WorkerSignals()
+
+        # set once finished or failed has been emitted
+        self.done = False
+        self._lock = threading.Lock()
+
+        # the dialog holds on to the task until its signals arrive
+        self.setAutoDelete(False)
+
+    def run(self):
+        """
+        Writes file, emitting finished with the path or failed with the error
+        """
+        try:
+            file_path = fileio.write_file(
+                self.file_path, self.anim_data, self.format)
+        except Exception as err:
+            LOG.exception("Failed to write {0}".format(self.file_path))
+            signal, result = self.signals.failed, str(err)
+        else:
+            signal, result = self.signals.finished, file_path
+
+        # emit and mark done together so detach sees one or the other
+        with self._lock:
+            self.done = True
+            signal.emit(result)
+
+    def detach(self):
+        """
+        Stops reporting to the dialog that started the task, the outcome
+        is only logged once the write ends
+
+        Tasks that already emitted are left alone, their result is queued
+        for the dialog and they will not emit again.
+        """
+        with self._lock:
+            if self.done:
+                return
+
+            self.signals.finished.disconnect()
+            self.signals.failed.disconnect()
+
+            DETACHED_TASKS.add(self)
+            self.signals.finished.connect(self.detached_done)
+            self.signals.failed.connect(self.detached_failed)
+
+    def detached_done(self, file_path):
+        """
+        Logs a write that finished after its dialog closed
+        """
+        DETACHED_TASKS.discard(self)
+        LOG.info("Export finished: {0}".format(file_path))
+
+    def detached_failed(self, error):
+        """
+        Releases a write that failed after its dialog closed, run already
+        logged the exception
+        """
+        DETACHED_TASKS.discard(self)
@@ -0,0 +1,76 @@
+"""
+Compression ratio against write and read throughput of every format and
+compression on synthetic mocap, to pick a default per studio.
+
+    python benchmarks/bench_compression.py [key_count]
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+import common
+
+from AnimIO import api
+from AnimIO import curve
+from AnimIO import fileio
+
+COMPRESSIONS = [None] + sorted(fileio.COMPRESSIONS)
+
+
+def add_noise(anim_data, scale=0.001):
+    """
+    Adds sensor style jitter to values so they compress like real takes
+    """
+    rand = random.Random(0)
+    for attribute in curve.ATTRIBUTES:
+        for curve_data in anim_data[attribute]:
+            for i, value in enumerate(curve_data.values):
+                curve_data.values[i] = value + rand.gauss(0.0, scale)
+
+    return anim_data
+
+
+def main(key_count=300000):
+    anim_data = add_noise(common.make_animdata(key_count))
+    temp_dir = tempfile.mkdtemp()
+
+    # keep per file log lines out of the report
+    api.LOG.setLevel("WARNING")
+
+    print("keys: {0:,}".format(key_count))
+    print("{0:<18} {1:>9} {2:>7} {3:>14} {4:>14}".format(
+        "format", "MB", "ratio", "write keys/s", "read keys/s"))
+
+    try:
+        for format in fileio.FORMATS:
+            plain_size = None
+            for compression in COMPRESSIONS:
+                if compression == "lzma" and fileio.lzma is None:
+                    continue
+
+                write_seconds, file_path = common.timed(
+                    api.write_file, os.path.join(temp_dir, format),
+                    anim_data, format=format, compression=compression)
+                read_seconds, read_data = common.timed(
+                    api.read_file, file_path, cached=False)
+                assert read_data["Rotation"] == anim_data["Rotation"]
+
+                size = os.path.getsize(file_path)
+                plain_size = plain_size or size
+
+                print("{0:<18} {1:>9.2f} {2:>7.2f} {3:>14,.0f} {4:>14,.0f}"
+                      .format("{0} {1}".format(format, compression or ""),
+                              size / 1e6,
+                              plain_size / size,
+                              key_count / write_seconds,
+                              key_count / read_seconds))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
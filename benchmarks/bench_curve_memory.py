@@ -0,0 +1,63 @@
+"""
+Memory per key of the columnar CurveData against the legacy key dicts.
+
+    python benchmarks/bench_curve_memory.py [key_count]
+"""
+from __future__ import absolute_import, print_function
+
+import sys
+import tracemalloc
+
+import common
+
+from AnimIO import api
+
+
+def legacy_curve_data(fcurve):
+    """
+    The original list of dicts implementation of api.get_curve_data
+    """
+    key_data_list = []
+
+    for key in fcurve.Keys:
+        key_data_list.append({
+            'time': key.Time.Get(),
+            'value': key.Value,
+            'interpolation': int(key.Interpolation),
+            'tangent-mode': int(key.TangentMode),
+            'constant-mode': int(key.TangentConstantMode),
+            'left-derivative': key.LeftDerivative,
+            'right-derivative': key.RightDerivative,
+            'left-weight': key.LeftTangentWeight,
+            'right-weight': key.RightTangentWeight
+        })
+
+    return key_data_list
+
+
+def measure(func, fcurve):
+    """
+    Returns (seconds, bytes retained by the result)
+    """
+    tracemalloc.start()
+    seconds, result = common.timed(func, fcurve)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return seconds, retained
+
+
+def main(key_count=200000):
+    fcurve = common.make_fcurve(key_count)
+
+    print("keys: {0:,}".format(key_count))
+    for name, func in (("legacy list of dicts", legacy_curve_data),
+                       ("CurveData", api.get_curve_data)):
+        seconds, retained = measure(func, fcurve)
+        common.report(name, seconds, key_count)
+        print("{0:<32} {1:>10.1f} bytes/key".format(
+            "", retained / float(key_count)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,42 @@
+"""
+File size and round trip time of the json and binary formats.
+
+    python benchmarks/bench_formats.py [key_count]
+"""
+from __future__ import absolute_import, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+
+import common
+
+from AnimIO import api
+
+
+def main(key_count=1000000):
+    anim_data = common.make_animdata(key_count)
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        print("keys: {0:,}".format(key_count))
+        for format, extension in (("json", ".json"), ("binary", ".aio")):
+            file_path = os.path.join(temp_dir, "bench" + extension)
+
+            write_seconds, _ = common.timed(
+                api.write_file, file_path, anim_data, format=format)
+            read_seconds, read_data = common.timed(
+                api.read_file, file_path, cached=False)
+            assert read_data["Rotation"] == anim_data["Rotation"]
+
+            common.report(format + " write", write_seconds, key_count)
+            common.report(format + " read", read_seconds, key_count)
+            print("{0:<32} {1:>10.1f} MB".format(
+                format + " size", os.path.getsize(file_path) / 1e6))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
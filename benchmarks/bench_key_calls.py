@@ -0,0 +1,137 @@
+"""
+SDK calls per key made by api.set_curve_data against the original two
+pass implementation, counted on the stand-in FBFCurve.
+
+    python benchmarks/bench_key_calls.py [key_count]
+"""
+from __future__ import absolute_import, division, print_function
+
+import sys
+from collections import Counter
+
+import common
+
+import pyfbsdk
+
+from AnimIO import api
+
+CALLS = Counter()
+
+
+class CountingKey(pyfbsdk.FBFCurveKey):
+    """
+    Key counting property gets and sets made after it was added
+    """
+    def __init__(self, time, value):
+        super(CountingKey, self).__init__(time, value)
+        self.__dict__["_added"] = True
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get("_added"):
+            CALLS["key." + name] += 1
+        super(CountingKey, self).__setattr__(name, value)
+
+    def __getattribute__(self, name):
+        if name[0].isupper() and object.__getattribute__(
+                self, "__dict__").get("_added"):
+            CALLS["key.get " + name] += 1
+        return super(CountingKey, self).__getattribute__(name)
+
+
+class CountingFCurve(pyfbsdk.FBFCurve):
+    """
+    FCurve counting method calls and Keys property access from outside
+    """
+    def __init__(self):
+        self._keys = []
+        self._internal = False
+        super(CountingFCurve, self).__init__()
+
+    @property
+    def Keys(self):
+        if not self._internal:
+            CALLS["fcurve.Keys"] += 1
+        return self._keys
+
+    @Keys.setter
+    def Keys(self, keys):
+        self._keys = keys
+
+    def _call(self, method, *args):
+        CALLS["fcurve." + method.__name__] += 1
+        self._internal = True
+        try:
+            return method(self, *args)
+        finally:
+            self._internal = False
+
+    def EditClear(self):
+        return self._call(pyfbsdk.FBFCurve.EditClear)
+
+    def KeyAdd(self, time, value):
+        return self._call(pyfbsdk.FBFCurve.KeyAdd, time, value)
+
+    def KeyRemove(self, index):
+        return self._call(pyfbsdk.FBFCurve.KeyRemove, index)
+
+    def EditBegin(self, key_count=-1):
+        CALLS["fcurve.EditBegin"] += 1
+
+    def EditEnd(self, key_count=-1):
+        CALLS["fcurve.EditEnd"] += 1
+
+
+def legacy_set_curve_data(fcurve, curve_data, frame_offset=0):
+    """
+    The original two pass implementation of api.set_curve_data
+    """
+    fcurve.EditClear()
+    fb_offset = pyfbsdk.FBTime(0, 0, 0, frame_offset, 0)
+
+    for key_data in curve_data.to_keys():
+        key_index = fcurve.KeyAdd(
+            pyfbsdk.FBTime(key_data['time']) + fb_offset, key_data['value'])
+        key = fcurve.Keys[key_index]
+
+        key.Interpolation = pyfbsdk.FBInterpolation.values[
+            key_data['interpolation']]
+        key.TangentMode = pyfbsdk.FBTangentMode.values[
+            key_data['tangent-mode']]
+        key.TangentConstantMode = pyfbsdk.FBTangentConstantMode.values[
+            key_data['constant-mode']]
+
+    for i, key_data in enumerate(curve_data.to_keys()):
+        key = fcurve.Keys[i]
+
+        key.LeftDerivative = key_data['left-derivative']
+        key.RightDerivative = key_data['right-derivative']
+
+        if not api.tangent_is_default_weight(key_data['left-weight']):
+            key.LeftTangentWeight = key_data['left-weight']
+
+        if not api.tangent_is_default_weight(key_data['right-weight']):
+            key.RightTangentWeight = key_data['right-weight']
+
+
+def main(key_count=100000):
+    curve_data = common.make_curve(key_count)
+    pyfbsdk.FBFCurveKey, original_key = CountingKey, pyfbsdk.FBFCurveKey
+
+    print("keys: {0:,}".format(key_count))
+    try:
+        for name, func in (("two pass", legacy_set_curve_data),
+                           ("single pass", api.set_curve_data)):
+            CALLS.clear()
+            seconds, _ = common.timed(func, CountingFCurve(), curve_data)
+            common.report(name, seconds, key_count)
+            print("{0:<32} {1:>10.2f} calls/key".format(
+                "", sum(CALLS.values()) / key_count))
+            for call, count in sorted(CALLS.items()):
+                print("{0:<32} {1:>10.2f}".format(
+                    "  " + call, count / key_count))
+    finally:
+        pyfbsdk.FBFCurveKey = original_key
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,60 @@
+"""
+Scaling of api.set_curve_data with key count on time ordered and
+shuffled keys, against adding shuffled keys one by one with KeyAdd.
+
+    python benchmarks/bench_key_scaling.py [max_key_count]
+"""
+from __future__ import absolute_import, print_function
+
+import random
+import sys
+
+import common
+
+import pyfbsdk
+
+from AnimIO import api
+
+# adding shuffled keys one by one is quadratic, stop it early
+NAIVE_MAX_KEYS = 100000
+
+
+def naive_add(fcurve, curve_data):
+    """
+    KeyAdd in file order, inserting into the middle of the curve
+    """
+    fcurve.EditClear()
+    for time, value in zip(curve_data.times, curve_data.values):
+        fcurve.KeyAdd(pyfbsdk.FBTime(int(time)), value)
+
+
+def main(max_key_count=1000000):
+    rand = random.Random(0)
+
+    print("{0:>10} {1:>16} {2:>16} {3:>16}".format(
+        "keys", "sorted us/key", "shuffled us/key", "naive us/key"))
+
+    key_count = 1000
+    while key_count <= max_key_count:
+        sorted_curve = common.make_curve(key_count)
+        order = list(range(key_count))
+        rand.shuffle(order)
+        shuffled_curve = sorted_curve.take(order)
+
+        row = [key_count]
+        for func, curve_data in ((api.set_curve_data, sorted_curve),
+                                 (api.set_curve_data, shuffled_curve),
+                                 (naive_add, shuffled_curve)):
+            if func is naive_add and key_count > NAIVE_MAX_KEYS:
+                row.append(float("nan"))
+                continue
+
+            seconds, _ = common.timed(func, pyfbsdk.FBFCurve(), curve_data)
+            row.append(seconds / key_count * 1e6)
+
+        print("{0:>10,} {1:>16.2f} {2:>16.2f} {3:>16.2f}".format(*row))
+        key_count *= 10
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
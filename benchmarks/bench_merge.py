@@ -0,0 +1,87 @@
+"""
+SDK calls of re-importing a curve that differs by a handful of keys,
+clearing and re-adding every key against merging only the differences.
+
+    python benchmarks/bench_merge.py [key_count]
+"""
+from __future__ import absolute_import, division, print_function
+
+import sys
+
+import common
+
+import pyfbsdk
+
+from AnimIO import api
+
+from bench_key_calls import CALLS, CountingFCurve, CountingKey
+
+
+def edited_curve(curve_data):
+    """
+    Copy of curve_data with a few keys edited, one removed and one added
+    """
+    indices = list(range(len(curve_data)))
+    del indices[len(indices) // 2]
+    edited = curve_data.take(indices)
+
+    for index in (10, 200, 3000):
+        index %= len(edited)
+        edited.values[index] += 1.0
+
+    edited.append(edited.times[-1] + pyfbsdk.TICKS_PER_FRAME, 0.0,
+                  *[column[-1] for column in (
+                      edited.interpolations, edited.tangent_modes,
+                      edited.constant_modes, edited.left_derivatives,
+                      edited.right_derivatives, edited.left_weights,
+                      edited.right_weights)])
+    return edited
+
+
+def main(key_count=100000):
+    curve_data = common.make_curve(key_count)
+    edited = edited_curve(curve_data)
+    pyfbsdk.FBFCurveKey, original_key = CountingKey, pyfbsdk.FBFCurveKey
+
+    print("keys: {0:,}".format(key_count))
+    try:
+        for name, merge in (("clear and re-add", False), ("merge", True)):
+            fcurve = CountingFCurve()
+            api.set_curve_data(fcurve, curve_data)
+
+            CALLS.clear()
+            seconds, _ = common.timed(
+                api.set_curve_data, fcurve, edited, merge=merge)
+
+            writes = sum(count for call, count in CALLS.items()
+                         if not call.startswith("key.get"))
+            common.report(name, seconds, key_count)
+            print("{0:<32} {1:>10,} writes {2:>10,} reads".format(
+                "", writes, sum(CALLS.values()) - writes))
+
+            assert api.get_curve_data(fcurve) == edited
+
+        # keys sharing a time merge like they import, the last one wins
+        duplicated = common.make_curve(7).take([1, 2, 2, 3, 5])
+        duplicated.values[2] += 1.0
+
+        # including a default weight following a non default one
+        weighted = common.make_curve(7).take([0, 0, 1])
+        weighted.left_weights[0] = weighted.right_weights[0] = 0.5
+
+        for curve_data in (duplicated, weighted):
+            imported, merged = CountingFCurve(), CountingFCurve()
+            api.set_curve_data(imported, curve_data)
+            api.set_curve_data(merged, common.make_curve(7))
+            api.set_curve_data(merged, curve_data, merge=True)
+
+            expected = curve_data.take(
+                [0, 2, 3, 4] if curve_data is duplicated else [1, 2])
+            assert api.get_curve_data(imported) == expected
+            assert api.get_curve_data(merged) == expected
+    finally:
+        pyfbsdk.FBFCurveKey = original_key
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,47 @@
+"""
+Throughput of shifting a 1M key time column by a frame offset, per key
+FBTime arithmetic against the whole column in integer ticks.
+
+    python benchmarks/bench_offset.py [key_count]
+"""
+from __future__ import absolute_import, print_function
+
+import sys
+
+import common
+
+import pyfbsdk
+
+from AnimIO import curve
+
+
+def legacy_offset(times, frame_offset):
+    """
+    The original per key FBTime arithmetic of api.set_curve_data
+    """
+    fb_offset = pyfbsdk.FBTime(0, 0, 0, frame_offset, 0)
+
+    # legacy key dicts held int ticks, the column is doubles on python 2
+    return [pyfbsdk.FBTime(int(time)) + fb_offset for time in times]
+
+
+def column_offset(times, frame_offset):
+    """
+    The column offset of api.set_curve_data
+    """
+    time_offset = pyfbsdk.FBTime(0, 0, 0, frame_offset, 0).Get()
+    return curve.offset_times(times, time_offset)
+
+
+def main(key_count=1000000, frame_offset=100):
+    times = common.make_curve(key_count, 0).times
+
+    print("keys: {0:,}".format(key_count))
+    for name, func in (("per key FBTime", legacy_offset),
+                       ("time column", column_offset)):
+        seconds, _ = common.timed(func, times, frame_offset)
+        common.report(name, seconds, key_count)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,54 @@
+"""
+Batch export of many objects, serial against the process pool pipeline.
+
+    python benchmarks/bench_pipeline.py [object_count] [keys_per_channel]
+"""
+from __future__ import absolute_import, print_function
+
+import multiprocessing
+import shutil
+import sys
+import tempfile
+
+import common
+
+import pyfbsdk
+
+from AnimIO import api, pipeline
+
+
+def main(object_count=200, key_count=2000, format="json"):
+    pyfbsdk.reset_scene()
+    curves = [common.make_curve(key_count, phase) for phase in range(6)]
+
+    models = []
+    for i in range(object_count):
+        # the second object maps to the same file name as the first
+        model = pyfbsdk.FBModelNull(
+            "Character_joint_0" if i == 1 else
+            "Character:joint_{0}".format(i))
+        for j, prop in enumerate((model.Translation, model.Rotation)):
+            prop.SetAnimated(True)
+            for k, node in enumerate(prop.GetAnimationNode().Nodes):
+                api.set_curve_data(node.FCurve, curves[j * 3 + k])
+        models.append(model)
+
+    api.LOG.setLevel("WARNING")
+    total_keys = object_count * 6 * key_count
+    print("objects: {0}, keys: {1:,}, format: {2}, cpus: {3}".format(
+        object_count, total_keys, format, multiprocessing.cpu_count()))
+
+    for name, workers in (("serial", 1), ("process pool", None)):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            seconds, paths = common.timed(
+                pipeline.export_objects, models, temp_dir, format,
+                workers=workers)
+            assert len(set(paths)) == object_count
+            common.report(name, seconds, total_keys)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]] + sys.argv[3:])
@@ -0,0 +1,35 @@
+"""
+Cost of exporting a shot's frame range out of a long take, against
+capturing the whole take.
+
+    python benchmarks/bench_range.py [keys_per_channel] [range_frames]
+"""
+from __future__ import absolute_import, print_function
+
+import sys
+
+import common
+
+from AnimIO import api
+
+
+def main(keys_per_channel=1000000, range_frames=300):
+    model = common.SyntheticModel("take", keys_per_channel * 6)
+    start = keys_per_channel // 2
+    end = start + range_frames
+
+    print("keys per channel: {0:,}, range: {1} frames".format(
+        keys_per_channel, range_frames))
+
+    seconds, anim_data = common.timed(api.get_animdata, model, start, end)
+    common.report("get_animdata range", seconds, 6 * (range_frames + 1))
+    print("{0:<32} {1:>10,} keys".format(
+        "", sum(len(channel) for channel in anim_data["Translation"] +
+                anim_data["Rotation"])))
+
+    seconds, _ = common.timed(api.get_animdata, model)
+    common.report("get_animdata whole take", seconds, 6 * keys_per_channel)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
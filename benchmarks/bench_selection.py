@@ -0,0 +1,57 @@
+"""
+get_selected on a large scene: full component scan against the index.
+
+    python benchmarks/bench_selection.py [component_count] [selected_count]
+"""
+from __future__ import absolute_import, print_function
+
+import sys
+
+import common
+
+import pyfbsdk
+
+from AnimIO import api, selection
+
+
+def scan_selected(type_filters=[]):
+    """
+    The original full scene scan implementation of api.get_selected
+    """
+    selected = []
+    for comp in pyfbsdk.FBSystem().Scene.Components:
+        if comp.Selected and \
+            hasattr(comp, "Animatable") and \
+                comp.ClassName() not in type_filters:
+            selected.append(comp)
+
+    return selected
+
+
+def main(component_count=100000, selected_count=10, queries=100):
+    pyfbsdk.reset_scene()
+    models = [pyfbsdk.FBModelNull("null_{0}".format(i))
+              for i in range(component_count)]
+    for model in models[::component_count // selected_count]:
+        model.Selected = True
+
+    # first query builds the index
+    build_seconds, _ = common.timed(api.get_selected)
+
+    print("components: {0:,}, selected: {1}, queries: {2}".format(
+        component_count, selected_count, queries))
+    print("{0:<32} {1:>10.3f}s".format("index build", build_seconds))
+
+    for name, func in (("scene scan", scan_selected),
+                       ("selection index", api.get_selected)):
+        seconds, _ = common.timed(
+            lambda: [func() for _ in range(queries)])
+        assert func() == scan_selected()
+        print("{0:<32} {1:>10.3f}ms/query".format(
+            name, seconds / queries * 1000.0))
+
+    selection.reset_index()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,49 @@
+"""
+Peak memory of write_file(get_animdata()) against stream_animdata.
+
+The take is generated on the fly so the stand-in scene itself does not
+hold the keys.
+
+    python benchmarks/bench_stream_memory.py [key_count]
+"""
+from __future__ import absolute_import, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+import common
+
+from AnimIO import api
+
+
+def main(key_count=5000000):
+    item = common.SyntheticModel("bench", key_count)
+    temp_dir = tempfile.mkdtemp()
+
+    def buffered():
+        api.write_file(
+            os.path.join(temp_dir, "buffered"), api.get_animdata(item))
+
+    def streamed():
+        api.stream_animdata(item, os.path.join(temp_dir, "streamed"))
+
+    try:
+        print("keys: {0:,}".format(key_count))
+        for name, func in (("get_animdata + write_file", buffered),
+                           ("stream_animdata", streamed)):
+            tracemalloc.start()
+            seconds, _ = common.timed(func)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            common.report(name, seconds, key_count)
+            print("{0:<32} {1:>10.1f} MB peak".format("", peak / 1e6))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,50 @@
+"""
+Wall clock of importing many objects with scene evaluation suspended by
+api.import_transaction, against evaluating after every model change.
+
+    python benchmarks/bench_transaction.py [object_count] [key_count]
+"""
+from __future__ import absolute_import, print_function
+
+import sys
+
+import common
+
+import pyfbsdk
+
+from AnimIO import api
+from AnimIO import curve
+
+
+def main(object_count=100, key_count=600):
+    pyfbsdk.reset_scene()
+    scene = pyfbsdk.FBSystem().Scene
+
+    anim_data = common.make_animdata(key_count * 6)
+    models = [pyfbsdk.FBModelNull("bench_{0}".format(i))
+              for i in range(object_count)]
+    batch_data = {curve.BATCH_KEY: dict(
+        (model.LongName, anim_data) for model in models)}
+
+    def per_object():
+        for model in models:
+            api.apply_animdata(model, anim_data)
+
+    def transaction():
+        api.set_batch_animdata(batch_data)
+
+    print("objects: {0}, keys: {1:,}".format(
+        object_count, object_count * 6 * key_count))
+    for name, func in (("evaluate per change", per_object),
+                       ("import_transaction", transaction)):
+        evaluations = scene.evaluations
+        seconds, _ = common.timed(func)
+        common.report(name, seconds, object_count * 6 * key_count)
+        print("{0:<32} {1:>10,} scene evaluations".format(
+            "", scene.evaluations - evaluations))
+
+
+if __name__ == '__main__':
+    # keep per object log lines out of the report
+    api.LOG.setLevel("WARNING")
+    main(*[int(arg) for arg in sys.argv[1:]])
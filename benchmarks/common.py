@@ -0,0 +1,165 @@
+"""
+Shared helpers for the AnimIO benchmarks.
+
+Puts the repository and the headless pyfbsdk stand-in on ``sys.path``
+so ``AnimIO.api`` imports outside MotionBuilder.
+"""
+from __future__ import absolute_import, print_function
+
+import math
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, os.path.join(BENCH_DIR, "stubs"))
+
+import pyfbsdk  # noqa: E402
+
+from AnimIO import curve  # noqa: E402
+
+
+def make_fcurve(key_count, start_frame=0):
+    """
+    Builds a stand-in fcurve with a sine wave keyed on every frame
+
+    :param key_count: number of keys
+    :type key_count: int
+
+    :param start_frame: frame of first key
+    :type start_frame: int
+
+    :return: fcurve
+    :rtype: pyfbsdk.FBFCurve
+    """
+    fcurve = pyfbsdk.FBFCurve()
+    for frame in range(start_frame, start_frame + key_count):
+        fcurve.KeyAdd(
+            pyfbsdk.FBTime(0, 0, 0, frame, 0), math.sin(frame * 0.05))
+    return fcurve
+
+
+def make_curve(key_count, phase=0.0):
+    """
+    Builds a baked mocap style CurveData keyed on every frame
+
+    :param key_count: number of keys
+    :type key_count: int
+
+    :param phase: phase offset of the sine wave
+    :type phase: float
+
+    :return: curve
+    :rtype: AnimIO.curve.CurveData
+    """
+    curve_data = curve.CurveData()
+    append = curve_data.append
+    cubic = int(pyfbsdk.FBInterpolation.kFBInterpolationCubic)
+    auto = int(pyfbsdk.FBTangentMode.kFBTangentModeAuto)
+    for frame in range(key_count):
+        x = frame * 0.05 + phase
+        append(frame * pyfbsdk.TICKS_PER_FRAME, math.sin(x),
+               cubic, auto, 0, math.cos(x), math.cos(x),
+               1.0 / 3.0, 1.0 / 3.0)
+    return curve_data
+
+
+def make_animdata(key_count):
+    """
+    Builds anim_data with key_count keys spread over six channels
+
+    :param key_count: total number of keys
+    :type key_count: int
+
+    :return: dict of data
+    :rtype: dict
+    """
+    per_channel = max(1, key_count // 6)
+    return {
+        "Translation": [make_curve(per_channel, i) for i in range(3)],
+        "Rotation": [make_curve(per_channel, i + 3) for i in range(3)],
+    }
+
+
+class SyntheticFCurve(object):
+    """
+    fcurve whose keys are generated when iterated, so huge takes can be
+    read without the stand-in holding them in memory
+    """
+    def __init__(self, key_count, phase=0.0):
+        self.key_count = key_count
+        self.phase = phase
+
+    @property
+    def Keys(self):
+        return SyntheticKeys(self)
+
+
+class SyntheticKeys(object):
+
+    def __init__(self, fcurve):
+        self.fcurve = fcurve
+
+    def __len__(self):
+        return self.fcurve.key_count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.fcurve.key_count:
+            raise IndexError(index)
+
+        x = index * 0.05 + self.fcurve.phase
+        key = pyfbsdk.FBFCurveKey(
+            pyfbsdk.FBTime(index * pyfbsdk.TICKS_PER_FRAME), math.sin(x))
+        key.LeftDerivative = key.RightDerivative = math.cos(x)
+        return key
+
+
+class SyntheticNode(object):
+
+    def __init__(self, fcurve):
+        self.FCurve = fcurve
+
+
+class SyntheticProperty(list):
+
+    def __init__(self, key_count, phase):
+        super(SyntheticProperty, self).__init__([0.0, 0.0, 0.0])
+        self.anim_node = type("AnimationNode", (object,), {})()
+        self.anim_node.Nodes = [
+            SyntheticNode(SyntheticFCurve(key_count, phase + i))
+            for i in range(3)]
+
+    def GetAnimationNode(self):
+        return self.anim_node
+
+
+class SyntheticModel(object):
+    """
+    Model whose translation and rotation curves are generated on the fly
+
+    :param key_count: total number of keys over the six channels
+    :type key_count: int
+    """
+    def __init__(self, name, key_count):
+        per_channel = max(1, key_count // 6)
+        self.LongName = name
+        self.Translation = SyntheticProperty(per_channel, 0.0)
+        self.Rotation = SyntheticProperty(per_channel, 3.0)
+
+
+def timed(func, *args, **kwargs):
+    """
+    Runs func and returns (seconds, result)
+    """
+    start = time.time()
+    result = func(*args, **kwargs)
+    return time.time() - start, result
+
+
+def report(name, seconds, keys):
+    """
+    Prints throughput of a stage
+    """
+    print("{0:<32} {1:>10.3f}s {2:>14,.0f} keys/s".format(
+        name, seconds, keys / seconds if seconds else float("inf")))
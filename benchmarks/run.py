@@ -0,0 +1,187 @@
+"""
+Benchmark harness for the api module
+
+Builds a synthetic take in the headless pyfbsdk stand-in and reports
+throughput, latency and peak memory of each api stage. Runs on plain
+python without MotionBuilder.
+
+    python benchmarks/run.py --objects 4 --keys 20000
+"""
+from __future__ import absolute_import, print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import common
+
+import pyfbsdk
+
+from AnimIO import api
+
+EXTENSIONS = {"json": ".json", "compact": ".json", "binary": ".aio"}
+
+
+def build_scene(object_count, key_count):
+    """
+    Creates animated models in the stand-in scene
+
+    :return: models and the curves to key on them
+    :rtype: tuple of (list, list of AnimIO.curve.CurveData)
+    """
+    pyfbsdk.reset_scene()
+
+    models = []
+    for i in range(object_count):
+        model = pyfbsdk.FBModelNull("bench_{0}".format(i))
+        model.Selected = True
+        model.Translation.SetAnimated(True)
+        model.Rotation.SetAnimated(True)
+        models.append(model)
+
+    curves = [common.make_curve(key_count, phase) for phase in range(6)]
+    return models, curves
+
+
+def iter_fcurves(models):
+    for model in models:
+        for prop in (model.Translation, model.Rotation):
+            for node in prop.GetAnimationNode().Nodes:
+                yield node.FCurve
+
+
+class Stage(object):
+    """
+    Result of one benchmarked stage
+    """
+    def __init__(self, name, seconds, calls, keys, peak):
+        self.name = name
+        self.seconds = seconds
+        self.calls = calls
+        self.keys = keys
+        self.peak = peak
+
+    def row(self):
+        return "{0:<24} {1:>9.3f} {2:>14,.0f} {3:>12.3f} {4:>10.1f}".format(
+            self.name,
+            self.seconds,
+            self.keys / self.seconds if self.seconds else float("inf"),
+            self.seconds / self.calls * 1000.0,
+            self.peak / 1e6)
+
+
+def measure(name, func, calls, keys, repeat=1):
+    """
+    Times func, best of repeat, then runs it once more under tracemalloc
+    for its peak memory so tracing does not skew the timings
+    """
+    seconds = None
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return Stage(name, seconds, calls, keys, peak)
+
+
+def run(object_count=4, key_count=20000, formats=("json", "binary"),
+        repeat=1):
+    """
+    Runs every stage and returns the results
+
+    :return: stage results in run order
+    :rtype: list of Stage
+    """
+    models, curves = build_scene(object_count, key_count)
+    channel_count = object_count * 6
+    total_keys = channel_count * key_count
+    temp_dir = tempfile.mkdtemp()
+    results = []
+
+    def set_curves():
+        for fcurve, curve_data in zip(
+                iter_fcurves(models), curves * object_count):
+            api.set_curve_data(fcurve, curve_data)
+
+    def get_curves():
+        for fcurve in iter_fcurves(models):
+            api.get_curve_data(fcurve)
+
+    def get_animdata():
+        for model in models:
+            api.get_animdata(model)
+
+    try:
+        results.append(measure(
+            "set_curve_data", set_curves, channel_count, total_keys, repeat))
+        results.append(measure(
+            "get_curve_data", get_curves, channel_count, total_keys, repeat))
+        results.append(measure(
+            "get_animdata", get_animdata, object_count, total_keys, repeat))
+
+        anim_data = api.get_animdata(models[0])
+        targets = [pyfbsdk.FBModelNull("target_{0}".format(i))
+                   for i in range(object_count)]
+
+        def set_animdata():
+            for target in targets:
+                api.set_animdata(target, anim_data)
+
+        results.append(measure(
+            "set_animdata", set_animdata, object_count, total_keys, repeat))
+
+        batch_data = api.get_batch_animdata(models)
+        for format in formats:
+            file_path = os.path.join(
+                temp_dir, format + EXTENSIONS[format])
+
+            results.append(measure(
+                "write_file " + format,
+                lambda: api.write_file(file_path, batch_data, format=format),
+                1, total_keys, repeat))
+            results.append(measure(
+                "read_file " + format,
+                lambda: api.read_file(file_path, cached=False),
+                1, total_keys, repeat))
+    finally:
+        shutil.rmtree(temp_dir)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the AnimIO api with a headless pyfbsdk.")
+    parser.add_argument("--objects", type=int, default=4,
+                        help="number of animated models")
+    parser.add_argument("--keys", type=int, default=20000,
+                        help="keys per channel, six channels per model")
+    parser.add_argument("--formats", nargs="+", default=["json", "binary"],
+                        choices=sorted(EXTENSIONS))
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per stage, best time is reported")
+    args = parser.parse_args()
+
+    # keep per call log lines out of the report
+    api.LOG.setLevel("WARNING")
+
+    print("objects: {0}, keys: {1:,}".format(
+        args.objects, args.objects * 6 * args.keys))
+    print("{0:<24} {1:>9} {2:>14} {3:>12} {4:>10}".format(
+        "stage", "seconds", "keys/s", "ms/call", "peak MB"))
+
+    for stage in run(args.objects, args.keys, args.formats, args.repeat):
+        print(stage.row())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,416 @@
+"""
+Headless stand-in for the parts of MotionBuilder's pyfbsdk used by AnimIO.
+
+Only mirrors the behaviour AnimIO depends on, so the api module can be
+benchmarked on a plain python install.
+"""
+import bisect
+
+TICKS_PER_SECOND = 46186158000
+FRAME_RATE = 30
+TICKS_PER_FRAME = TICKS_PER_SECOND // FRAME_RATE
+
+
+class _Enum(int):
+    """
+    Mimics boost.python enums, an int with a name
+    """
+    def __new__(cls, value, name):
+        obj = int.__new__(cls, value)
+        obj.name = name
+        return obj
+
+    def __repr__(self):
+        return "pyfbsdk.{0}".format(self.name)
+
+
+def _make_enum(type_name, names):
+    enum_type = type(type_name, (_Enum,), {})
+    enum_type.values = {}
+    enum_type.names = {}
+    for value, name in enumerate(names):
+        member = enum_type(value, name)
+        setattr(enum_type, name, member)
+        enum_type.values[value] = member
+        enum_type.names[name] = member
+    return enum_type
+
+
+FBInterpolation = _make_enum("FBInterpolation", [
+    "kFBInterpolationConstant",
+    "kFBInterpolationLinear",
+    "kFBInterpolationCubic",
+    "kFBInterpolationCustom"])
+
+FBTangentMode = _make_enum("FBTangentMode", [
+    "kFBTangentModeAuto",
+    "kFBTangentModeTCB",
+    "kFBTangentModeUser",
+    "kFBTangentModeBreak",
+    "kFBTangentModeTimeIndependent",
+    "kFBTangentModeClampProgressive"])
+
+FBTangentConstantMode = _make_enum("FBTangentConstantMode", [
+    "kFBTangentConstantModeNormal",
+    "kFBTangentConstantModeNext"])
+
+FBSceneChangeType = _make_enum("FBSceneChangeType", [
+    "kFBSceneChangeNone",
+    "kFBSceneChangeDestroy",
+    "kFBSceneChangeAttach",
+    "kFBSceneChangeDetach",
+    "kFBSceneChangeAddChild",
+    "kFBSceneChangeRemoveChild",
+    "kFBSceneChangeSelect",
+    "kFBSceneChangeUnselect",
+    "kFBSceneChangeRename"])
+
+
+class _EventSource(object):
+    """
+    Callback list like FBScene.OnChange
+    """
+    def __init__(self):
+        self._callbacks = []
+
+    def Add(self, callback):
+        self._callbacks.append(callback)
+
+    def Remove(self, callback):
+        self._callbacks.remove(callback)
+
+    def RemoveAll(self):
+        del self._callbacks[:]
+
+    def fire(self, control, event):
+        for callback in list(self._callbacks):
+            callback(control, event)
+
+
+class FBEventSceneChange(object):
+
+    def __init__(self, event_type, component, child_component=None):
+        self.Type = event_type
+        self.Component = component
+        self.ChildComponent = child_component
+
+
+class FBEvent(object):
+
+    def __init__(self, event_type=0):
+        self.Type = event_type
+
+
+class FBTime(object):
+
+    __slots__ = ("_ticks",)
+
+    def __init__(self, *args):
+        if any(isinstance(arg, float) for arg in args):
+            # boost.python only converts ints to long long
+            raise TypeError("FBTime takes integer ticks or frames")
+
+        if len(args) <= 1:
+            self._ticks = int(args[0]) if args else 0
+        else:
+            hours, minutes, seconds, frames = (tuple(args) + (0,) * 4)[:4]
+            self._ticks = (
+                ((hours * 60 + minutes) * 60 + seconds) * TICKS_PER_SECOND +
+                frames * TICKS_PER_FRAME)
+
+    def Get(self):
+        return self._ticks
+
+    def GetFrame(self):
+        return self._ticks // TICKS_PER_FRAME
+
+    def GetSecondDouble(self):
+        return self._ticks / float(TICKS_PER_SECOND)
+
+    def __add__(self, other):
+        return FBTime(self._ticks + other._ticks)
+
+    def __sub__(self, other):
+        return FBTime(self._ticks - other._ticks)
+
+    def __eq__(self, other):
+        return isinstance(other, FBTime) and self._ticks == other._ticks
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._ticks)
+
+
+class FBFCurveKey(object):
+
+    def __init__(self, time, value):
+        self.Time = time
+        self.Value = value
+        self.Interpolation = FBInterpolation.kFBInterpolationCubic
+        self.TangentMode = FBTangentMode.kFBTangentModeAuto
+        self.TangentConstantMode = \
+            FBTangentConstantMode.kFBTangentConstantModeNormal
+        self.LeftDerivative = 0.0
+        self.RightDerivative = 0.0
+        self.LeftTangentWeight = 1.0 / 3.0
+        self.RightTangentWeight = 1.0 / 3.0
+
+
+class FBFCurve(object):
+
+    def __init__(self):
+        self.Keys = []
+        self._times = []
+
+    def EditClear(self):
+        del self.Keys[:]
+        del self._times[:]
+
+    def KeyRemove(self, index):
+        del self.Keys[index]
+        del self._times[index]
+        return True
+
+    def EditBegin(self, key_count=-1):
+        pass
+
+    def EditEnd(self, key_count=-1):
+        _models_changed()
+
+    def Evaluate(self, time):
+        """
+        Value at time, holding the nearest earlier key
+        """
+        if not self._times:
+            return 0.0
+
+        index = bisect.bisect_right(self._times, time.Get()) - 1
+        return self.Keys[max(index, 0)].Value
+
+    def KeyAdd(self, time, value):
+        ticks = time.Get()
+
+        # keys past the last key are appended without searching
+        if not self._times or ticks > self._times[-1]:
+            self._times.append(ticks)
+            self.Keys.append(FBFCurveKey(FBTime(ticks), value))
+            return len(self._times) - 1
+
+        index = bisect.bisect_left(self._times, ticks)
+
+        # adding on an existing key replaces its value
+        if index < len(self._times) and self._times[index] == ticks:
+            self.Keys[index].Value = value
+            return index
+
+        self._times.insert(index, ticks)
+        self.Keys.insert(index, FBFCurveKey(FBTime(ticks), value))
+        return index
+
+
+class FBVector3d(list):
+
+    def __init__(self, *args):
+        if len(args) == 1:
+            values = list(args[0])
+        else:
+            values = list(args) or [0.0, 0.0, 0.0]
+        super(FBVector3d, self).__init__(values)
+
+
+class FBAnimationNode(object):
+
+    def __init__(self, name, fcurve=None):
+        self.Name = name
+        self.FCurve = fcurve
+        self.Nodes = []
+
+
+class FBPropertyAnimatableVector3d(object):
+    """
+    Animatable vector property such as FBModel.Translation
+    """
+    def __init__(self, name):
+        self.Name = name
+        self.Data = FBVector3d()
+        self._anim_node = None
+
+    def __getitem__(self, index):
+        return self.Data[index]
+
+    def __len__(self):
+        return 3
+
+    def __iter__(self):
+        return iter(self.Data)
+
+    def SetAnimated(self, animated):
+        if animated and self._anim_node is None:
+            self._anim_node = FBAnimationNode(self.Name)
+            self._anim_node.Nodes = [
+                FBAnimationNode(axis, FBFCurve()) for axis in "XYZ"]
+        elif not animated:
+            self._anim_node = None
+        _models_changed()
+
+    def _evaluate(self, time):
+        if self._anim_node is None:
+            return list(self.Data)
+        return [node.FCurve.Evaluate(time) for node in self._anim_node.Nodes]
+
+    def IsAnimated(self):
+        return self._anim_node is not None
+
+    def GetAnimationNode(self):
+        return self._anim_node
+
+
+class FBComponent(object):
+
+    def __init__(self, name):
+        self.Name = name
+        self.LongName = name
+        self._selected = False
+
+    @property
+    def Selected(self):
+        return self._selected
+
+    @Selected.setter
+    def Selected(self, selected):
+        if selected == self._selected:
+            return
+
+        self._selected = selected
+        if self in FBSystem().Scene.Components:
+            FBSystem().Scene._notify(
+                FBSceneChangeType.kFBSceneChangeSelect if selected
+                else FBSceneChangeType.kFBSceneChangeUnselect, self)
+
+    def ClassName(self):
+        return type(self).__name__
+
+    def FBDelete(self):
+        scene = FBSystem().Scene
+        scene.Components.remove(self)
+        scene._notify(FBSceneChangeType.kFBSceneChangeDestroy, self)
+
+
+class FBModel(FBComponent):
+
+    def __init__(self, name):
+        super(FBModel, self).__init__(name)
+        self.Animatable = True
+        self._translation = FBPropertyAnimatableVector3d("Lcl Translation")
+        self._rotation = FBPropertyAnimatableVector3d("Lcl Rotation")
+
+        scene = FBSystem().Scene
+        scene.Components.append(self)
+        scene._notify(FBSceneChangeType.kFBSceneChangeAttach, self)
+
+    @property
+    def Translation(self):
+        return self._translation
+
+    @Translation.setter
+    def Translation(self, value):
+        self._translation.Data = FBVector3d(value)
+        _models_changed()
+
+    @property
+    def Rotation(self):
+        return self._rotation
+
+    @Rotation.setter
+    def Rotation(self, value):
+        self._rotation.Data = FBVector3d(value)
+        _models_changed()
+
+    def _evaluate(self, time):
+        return (self._translation._evaluate(time),
+                self._rotation._evaluate(time))
+
+
+class FBModelNull(FBModel):
+    pass
+
+
+class FBScene(object):
+
+    def __init__(self):
+        self.Components = []
+        self.OnChange = _EventSource()
+        self.evaluations = 0
+
+    def _notify(self, event_type, component):
+        self.OnChange.fire(self, FBEventSceneChange(event_type, component))
+
+    def Evaluate(self):
+        """
+        Stand-in evaluation, every model is evaluated at the current time
+        """
+        self.evaluations += 1
+        time = FBTime(0)
+        for comp in self.Components:
+            if isinstance(comp, FBModel):
+                comp._evaluate(time)
+
+
+class FBApplication(object):
+    """
+    Shared application, every instance sees the same file events
+    """
+    OnFileNew = _EventSource()
+    OnFileNewCompleted = _EventSource()
+    OnFileOpen = _EventSource()
+    OnFileOpenCompleted = _EventSource()
+    OnFileMerge = _EventSource()
+
+    def FileNew(self):
+        FBApplication.OnFileNew.fire(self, FBEvent())
+        del FBSystem().Scene.Components[:]
+        FBApplication.OnFileNewCompleted.fire(self, FBEvent())
+
+
+class FBSystem(object):
+    """
+    Shared system, every instance sees the same scene like MotionBuilder
+    """
+    _scene = FBScene()
+
+    @property
+    def Scene(self):
+        return FBSystem._scene
+
+    def GetPythonStartupPath(self):
+        return []
+
+
+# nesting depth of FBBeginChangeAllModels calls
+_change_depth = [0]
+
+
+def _models_changed():
+    """
+    Stand-in only, re-evaluates the scene as MotionBuilder does after a
+    model changes, unless changes are suspended
+    """
+    if not _change_depth[0]:
+        FBSystem().Scene.Evaluate()
+
+
+def FBBeginChangeAllModels():
+    _change_depth[0] += 1
+
+
+def FBEndChangeAllModels():
+    _change_depth[0] = max(_change_depth[0] - 1, 0)
+
+
+def reset_scene():
+    """
+    Stand-in only, empties the scene like File > New
+    """
+    FBApplication().FileNew()
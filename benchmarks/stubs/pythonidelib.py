@@ -0,0 +1,7 @@
+"""
+Headless stand-in for MotionBuilder's pythonidelib module.
+"""
+
+
+def FlushOutput():
+    pass